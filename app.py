@@ -6,13 +6,12 @@ import sqlite3
 
 from config.config import FULL_DATABASE_FILE_PATH
 from database.db_models import create_connection
-from initial_setup.db_setup import setup_database
+from initial_setup.db_setup import setup_database, migrate_database
 from utils.utils_uuid import derive_uuid
 from utils.utils_logging import get_logger_from_session, log_page_view, log_authentication
-from app.pages import login, admin_panel
-from app.components.ai_analysis import render_ai_analysis_page
-from app.components.dashboard import render_dashboard
-from app.components.system_status import render_system_status_sidebar, check_system_ready_for_upload
+from app.pages import login
+# The post-login components (OCR/LLM processing, system checker, admin panel) are
+# imported inside render_main_app so the login page doesn't pay for them.
 
 
 def initialize_database():
@@ -25,35 +24,25 @@ def initialize_database():
         print("Database setup completed")
     else:
         print(f"Database already exists at {FULL_DATABASE_FILE_PATH}")
+        migrate_database()
+
+
+_SESSION_DEFAULTS = (
+    ('logged_in', False),
+    ('user_uuid', None),
+    ('org_uuid', None),
+    ('username', None),
+    ('role_name', None),
+    ('active_tab', 0),
+)
 
 
 def initialize_session_state():
     """Initialize session state variables."""
     print("=== INITIALIZING SESSION STATE ===")
     
-    if 'logged_in' not in st.session_state:
-        st.session_state['logged_in'] = False
-        print("Initialized 'logged_in' to False")
-    
-    if 'user_uuid' not in st.session_state:
-        st.session_state['user_uuid'] = None
-        print("Initialized 'user_uuid' to None")
-    
-    if 'org_uuid' not in st.session_state:
-        st.session_state['org_uuid'] = None
-        print("Initialized 'org_uuid' to None")
-    
-    if 'username' not in st.session_state:
-        st.session_state['username'] = None
-        print("Initialized 'username' to None")
-    
-    if 'role_name' not in st.session_state:
-        st.session_state['role_name'] = None
-        print("Initialized 'role_name' to None")
-    
-    if 'active_tab' not in st.session_state:
-        st.session_state['active_tab'] = 0
-        print("Initialized 'active_tab' to 0")
+    for key, default in _SESSION_DEFAULTS:
+        st.session_state.setdefault(key, default)
     
     print("Session state initialization complete")
 
@@ -192,6 +181,9 @@ def inject_tab_css():
 
 def render_main_app():
     """Render main application after login."""
+    from app.components.ai_analysis import render_ai_analysis_page
+    from app.components.system_status import render_system_status_sidebar
+
     username = st.session_state.get("username", "unknown")
     role     = st.session_state.get("role_name", "unknown")
 
@@ -274,6 +266,7 @@ def render_main_app():
             if st.session_state.get("active_tab") != 2:
                 st.session_state.active_tab = 2
             log_page_view(st.session_state, "/admin")
+            from app.pages import admin_panel
             admin_panel.render_admin_panel()
 
         with tabs[3]:
@@ -14,7 +14,7 @@ from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode
 from app.components.system_status import prepare_ollama_models_background, check_system_ready_for_upload
 from database.db_models import create_connection, Batch, Document, DocumentCategory
 from utils.utils_system_specs import get_system_specs
-from utils.ocr_processing import process_document_with_available_ocr, convert_pdf_to_image_bytes
+from utils.ocr_processing import process_document_with_available_ocr
 from utils.llm_processing import process_document_categorization
 from utils.utils import custom_badge
 
@@ -254,18 +254,12 @@ def create_batch_and_documents():
         pdf_bytes = uploaded_file.getvalue()
         print(f"  PDF size: {len(pdf_bytes)} bytes")
         
-        # Convert PDF pages to PNG image bytes for OCR fallback
-        print("  Converting PDF to image...")
-        image_bytes = convert_pdf_to_image_bytes(pdf_bytes)
-        print(f"  Image size: {len(image_bytes)} bytes")
-        
         document_data = {
             "organization_uuid": org_uuid,
             "batch_uuid": batch_uuid,
             "upload_name": uploaded_file.name,
             "upload_folder": None,
-            "pdf": pdf_bytes,
-            "image_of_pdf": image_bytes
+            "pdf": pdf_bytes
         }
         
         print(f"  Inserting document into database...")
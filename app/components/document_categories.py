@@ -2,6 +2,7 @@
 import streamlit as st
 import pandas as pd
 from database.db_models import Category, Stamps, create_connection
+from utils.llm_processing import clear_category_cache
 from utils.utils_uuid import derive_uuid
 from utils.utils import get_utc_datetime
 
@@ -214,6 +215,7 @@ def render_add_category_form(organization_uuid, level, parent_category_uuid=None
                         created_by=st.session_state.get('user_uuid'),
                         updated_by=st.session_state.get('user_uuid')
                     )
+                    clear_category_cache()
                     st.success(f"Category '{name}' added successfully!")
                     st.session_state[f'adding_level_{level}'] = False
                     st.rerun()
@@ -284,6 +286,7 @@ def render_edit_category_form(category_data, organization_uuid):
                         min_threshold=min_threshold,
                         updated_by=st.session_state.get('user_uuid')
                     )
+                    clear_category_cache()
                     st.success(f"Category '{name}' updated successfully!")
                     st.session_state['editing_category'] = None
                     st.rerun()
@@ -314,6 +317,7 @@ def render_delete_confirmation(category_data):
                 try:
                     category = Category()
                     category.delete(category_data['category_uuid'])
+                    clear_category_cache()
                     st.success(f"Category '{category_data['name']}' deleted!")
                     st.session_state['deleting_category'] = None
                     if f'selected_level_{category_data["hierarchy_level"]}' in st.session_state:
@@ -2,6 +2,8 @@
 import streamlit as st
 import pandas as pd
 from database.db_models import LLMModel, create_connection
+from utils.llm_processing import clear_category_cache
+from initial_setup.system_checker import invalidate_model_cache
 from utils.utils_logging import (
     get_logger_from_session, log_page_view, log_button_click,
     log_form_submit, log_database_operation
@@ -14,7 +16,7 @@ def get_all_llm_models():
     query = """
         SELECT llm_model_uuid, system, name, description, min_ram_gb, 
                default_timeout, gpu_required, gpu_optional, min_vram_gb, 
-               is_active, created_datetime, updated_datetime
+               num_predict, num_ctx, is_active, created_datetime, updated_datetime
         FROM llm_models
         ORDER BY system, name
     """
@@ -53,7 +55,8 @@ def render_llm_models_management():
         
         # Select columns for display
         edit_columns = ['system', 'name', 'min_ram_gb', 'default_timeout', 
-                       'gpu_required', 'gpu_optional', 'min_vram_gb', 'is_active']
+                       'gpu_required', 'gpu_optional', 'min_vram_gb',
+                       'num_predict', 'num_ctx', 'is_active']
         
         # Data editor
         edited_df = st.data_editor(
@@ -70,6 +73,8 @@ def render_llm_models_management():
                 'gpu_required': st.column_config.CheckboxColumn('GPU Req'),
                 'gpu_optional': st.column_config.CheckboxColumn('GPU Opt'),
                 'min_vram_gb': st.column_config.NumberColumn('Min VRAM (GB)', min_value=0, max_value=512),
+                'num_predict': st.column_config.NumberColumn('Max Tokens', min_value=16, max_value=8192),
+                'num_ctx': st.column_config.NumberColumn('Context', min_value=512, max_value=131072),
                 'is_active': st.column_config.CheckboxColumn('Active')
             },
             key='llm_models_editor'
@@ -116,6 +121,8 @@ def render_llm_models_management():
             st.markdown(f"**Min RAM:** {model_data['min_ram_gb']} GB")
             st.markdown(f"**Min VRAM:** {model_data['min_vram_gb']} GB")
             st.markdown(f"**Timeout:** {model_data['default_timeout']} seconds")
+            st.markdown(f"**Max Tokens:** {model_data['num_predict']}")
+            st.markdown(f"**Context Window:** {model_data['num_ctx']}")
             st.markdown(f"**GPU Required:** {'Yes' if model_data['gpu_required'] else 'No'}")
             st.markdown(f"**GPU Optional:** {'Yes' if model_data['gpu_optional'] else 'No'}")
             st.markdown(f"**Active:** {'Yes' if model_data['is_active'] else 'No'}")
@@ -144,7 +151,8 @@ def save_changes(original_df, edited_df):
     # Merge to find changes
     merged = edited_df.merge(
         original_df[['llm_model_uuid', 'system', 'name', 'min_ram_gb', 'default_timeout',
-                     'gpu_required', 'gpu_optional', 'min_vram_gb', 'is_active']],
+                     'gpu_required', 'gpu_optional', 'min_vram_gb', 'num_predict', 'num_ctx',
+                     'is_active']],
         on='llm_model_uuid',
         suffixes=('_new', '_old')
     )
@@ -185,6 +193,14 @@ def save_changes(original_df, edited_df):
             update_params['min_vram_gb'] = int(row['min_vram_gb_new'])
             changed = True
         
+        if row['num_predict_new'] != row['num_predict_old']:
+            update_params['num_predict'] = int(row['num_predict_new'])
+            changed = True
+        
+        if row['num_ctx_new'] != row['num_ctx_old']:
+            update_params['num_ctx'] = int(row['num_ctx_new'])
+            changed = True
+        
         if row['is_active_new'] != row['is_active_old']:
             update_params['is_active'] = 1 if row['is_active_new'] else 0
             changed = True
@@ -193,6 +209,8 @@ def save_changes(original_df, edited_df):
             try:
                 llm_model = LLMModel()
                 llm_model.update(**update_params)
+                clear_category_cache()
+                invalidate_model_cache()  # compatible-model lists
                 changes_made += 1
                 log_database_operation(st.session_state, '/admin/llm_models', 
                                       'UPDATE', 'llm_models', success=True)
@@ -221,15 +239,17 @@ def render_add_form():
         
         with col1:
             system = st.text_input("System*", placeholder="e.g., Ollama")
-            name = st.text_input("Name*", placeholder="e.g., llama2:7b")
+            name = st.text_input("Name*", placeholder="e.g., llama3.1:8b-instruct-q4_K_M")
             min_ram_gb = st.number_input("Min RAM (GB)*", min_value=0, value=8)
             min_vram_gb = st.number_input("Min VRAM (GB)", min_value=0, value=0)
+            num_predict = st.number_input("Max Tokens (num_predict)", min_value=16, value=128)
         
         with col2:
             default_timeout = st.number_input("Default Timeout (seconds)*", min_value=1, value=60)
             gpu_required = st.checkbox("GPU Required")
             gpu_optional = st.checkbox("GPU Optional")
             is_active = st.checkbox("Active", value=True)
+            num_ctx = st.number_input("Context Window (num_ctx)", min_value=512, value=2048)
         
         description = st.text_area("Description", placeholder="Describe the model's capabilities")
         
@@ -260,10 +280,14 @@ def render_add_form():
                         gpu_required=1 if gpu_required else 0,
                         gpu_optional=1 if gpu_optional else 0,
                         min_vram_gb=min_vram_gb,
+                        num_predict=num_predict,
+                        num_ctx=num_ctx,
                         is_active=1 if is_active else 0
                     )
                     log_database_operation(st.session_state, '/admin/llm_models', 
                                           'INSERT', 'llm_models', success=True)
+                    clear_category_cache()
+                    invalidate_model_cache()  # compatible-model lists
                     st.success(f"Model '{name}' added successfully!")
                     st.session_state['adding_llm_model'] = False
                     st.rerun()
@@ -291,6 +315,8 @@ def render_description_editor(model_data):
                         llm_model_uuid=model_data['llm_model_uuid'],
                         description=new_description
                     )
+                    clear_category_cache()
+                    invalidate_model_cache()  # compatible-model lists
                     st.success("Description updated!")
                     st.session_state['editing_description'] = None
                     log_database_operation(st.session_state, '/admin/llm_models', 
@@ -2,6 +2,8 @@
 import streamlit as st
 import pandas as pd
 from database.db_models import OCRModel, create_connection
+from utils.ocr_processing import clear_ocr_render_scales
+from initial_setup.system_checker import invalidate_model_cache
 
 
 def get_all_ocr_models():
@@ -9,7 +11,7 @@ def get_all_ocr_models():
     conn = create_connection()
     query = """
         SELECT ocr_models_uuid, name, default_language, default_dpi, 
-               max_pages, is_active, created_datetime, updated_datetime
+               max_pages, render_scale, is_active, created_datetime, updated_datetime
         FROM ocr_models
         ORDER BY name
     """
@@ -39,7 +41,7 @@ def render_ocr_models_management():
         display_df = df.copy()
         display_df['is_active'] = display_df['is_active'].astype(bool)
         
-        edit_columns = ['name', 'default_language', 'default_dpi', 'max_pages', 'is_active']
+        edit_columns = ['name', 'default_language', 'default_dpi', 'max_pages', 'render_scale', 'is_active']
         
         edited_df = st.data_editor(
             display_df[['ocr_models_uuid'] + edit_columns],
@@ -52,6 +54,7 @@ def render_ocr_models_management():
                 'default_language': st.column_config.TextColumn('Language', width='small'),
                 'default_dpi': st.column_config.NumberColumn('DPI', min_value=72, max_value=1200),
                 'max_pages': st.column_config.NumberColumn('Max Pages', min_value=1, max_value=1000),
+                'render_scale': st.column_config.NumberColumn('Render Scale', min_value=0.5, max_value=6.0, step=0.25),
                 'is_active': st.column_config.CheckboxColumn('Active')
             },
             key='ocr_models_editor'
@@ -94,6 +97,7 @@ def render_ocr_models_management():
             st.markdown(f"**Language:** {model_data['default_language']}")
             st.markdown(f"**DPI:** {model_data['default_dpi']}")
             st.markdown(f"**Max Pages:** {model_data['max_pages']}")
+            st.markdown(f"**Render Scale:** {model_data['render_scale']}")
             st.markdown(f"**Active:** {'Yes' if model_data['is_active'] else 'No'}")
             
             st.markdown("---")
@@ -104,7 +108,8 @@ def render_ocr_models_management():
 def save_changes(original_df, edited_df):
     """Save changes to database."""
     merged = edited_df.merge(
-        original_df[['ocr_models_uuid', 'name', 'default_language', 'default_dpi', 'max_pages', 'is_active']],
+        original_df[['ocr_models_uuid', 'name', 'default_language', 'default_dpi', 'max_pages',
+                     'render_scale', 'is_active']],
         on='ocr_models_uuid',
         suffixes=('_new', '_old')
     )
@@ -126,6 +131,9 @@ def save_changes(original_df, edited_df):
         if row['max_pages_new'] != row['max_pages_old']:
             update_params['max_pages'] = int(row['max_pages_new'])
             changed = True
+        if row['render_scale_new'] != row['render_scale_old']:
+            update_params['render_scale'] = float(row['render_scale_new'])
+            changed = True
         if row['is_active_new'] != row['is_active_old']:
             update_params['is_active'] = 1 if row['is_active_new'] else 0
             changed = True
@@ -134,6 +142,8 @@ def save_changes(original_df, edited_df):
             try:
                 ocr_model = OCRModel()
                 ocr_model.update(**update_params)
+                clear_ocr_render_scales()
+                invalidate_model_cache()  # compatible-model lists
                 changes_made += 1
             except Exception as e:
                 st.error(f"Error updating {row['name_new']}: {str(e)}")
@@ -157,6 +167,7 @@ def render_add_form():
         
         with col2:
             max_pages = st.number_input("Max Pages*", min_value=1, value=10)
+            render_scale = st.number_input("Render Scale", min_value=0.5, max_value=6.0, value=2.0, step=0.25)
             is_active = st.checkbox("Active", value=True)
         
         col_submit, col_cancel = st.columns(2)
@@ -182,8 +193,11 @@ def render_add_form():
                         default_language=default_language,
                         default_dpi=default_dpi,
                         max_pages=max_pages,
+                        render_scale=render_scale,
                         is_active=1 if is_active else 0
                     )
+                    clear_ocr_render_scales()
+                    invalidate_model_cache()  # compatible-model lists
                     st.success(f"Model '{name}' added!")
                     st.session_state['adding_ocr_model'] = False
                     st.rerun()
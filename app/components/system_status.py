@@ -10,6 +10,7 @@ from initial_setup.system_checker import (
     check_required_ollama_models,
     check_ocr_dependencies,
     enable_ollama_airplane_mode,
+    invalidate_binary_cache,
     start_ollama_service
 )
 from initial_setup.llm_installer import (
@@ -60,9 +61,6 @@ def render_system_status_sidebar():
                 if not status.get('ocr', {}).get('at_least_one_available'):
                     issues.append("No OCR models")
                 
-                if not status.get('poppler', {}).get('installed'):
-                    issues.append("Poppler not installed")
-                
                 if issues:
                     with st.expander("Issues"):
                         for issue in issues:
@@ -70,7 +68,8 @@ def render_system_status_sidebar():
                         
             if st.button("🔄 Refresh Status", key="refresh_system_status", width='stretch'):
                 with st.spinner("Refreshing system status..."):
-                    st.session_state['system_status'] = check_all_dependencies()
+                    invalidate_binary_cache()
+                    st.session_state['system_status'] = check_all_dependencies(use_cache=False)
                     st.rerun()
 
             st.markdown("---")
@@ -83,7 +82,7 @@ def render_system_status_sidebar():
             
             for model_name, model_info in ocr_models.items():
                 if model_info.get('installed') and model_info.get('running'):
-                    st.caption(f"✅ **{model_name}:** {model_info.get('version', 'Installed')}")
+                    st.caption(f"✅ **{model_name}:** {model_info.get('version') or 'Installed'}")
                 else:
                     st.caption(f"❌ **{model_name}:** {model_info.get('error', 'Not installed')}")
                     if st.button(f"Install {model_name}", key=f"install_ocr_{model_name}"):
@@ -102,7 +101,7 @@ def render_system_status_sidebar():
                 if st.button("📥 Install Ollama", key="show_ollama_install"):
                     st.session_state['show_ollama_install_guide'] = True
             else:
-                st.caption(f"✅ **Version:** {ollama_info.get('version', 'Unknown')}")
+                st.caption(f"✅ **Version:** {ollama_info.get('version') or 'Installed'}")
                 
                 if not ollama_info.get('running'):
                     st.warning("⚠️ Ollama service not running")
@@ -111,7 +110,7 @@ def render_system_status_sidebar():
                             start_result = start_ollama_service()
                             if start_result['success']:
                                 st.success("Ollama service started!")
-                                st.session_state['system_status'] = check_all_dependencies()
+                                st.session_state['system_status'] = check_all_dependencies(use_cache=False)
                                 st.rerun()
                             else:
                                 st.error(f"Failed to start: {start_result['message']}")
@@ -127,7 +126,8 @@ def render_system_status_sidebar():
                     all_working = models_info.get('all_working', False)
                     
                     if required_models:
-                        working_count = len([m for m in required_models if m not in missing_models and m not in broken_models])
+                        not_working = frozenset(missing_models).union(broken_models)
+                        working_count = sum(1 for m in required_models if m not in not_working)
                         st.caption(f"**Models:** {working_count}/{len(required_models)} working")
                         
                         # Show missing models
@@ -153,7 +153,7 @@ def render_system_status_sidebar():
                                     download_result = download_all_required_models()
                                     if download_result['success']:
                                         st.success("All models pulled successfully!")
-                                        st.session_state['system_status'] = check_all_dependencies()
+                                        st.session_state['system_status'] = check_all_dependencies(use_cache=False)
                                         st.rerun()
                                     else:
                                         failed = download_result.get('models_failed', [])
@@ -203,14 +203,6 @@ def render_system_status_sidebar():
             if 'python' in specs:
                 st.markdown("#### Python")
                 st.caption(f"Version: {specs['python']['version']}")
-            
-            # Poppler Status
-            st.markdown("#### Poppler")
-            poppler_status = status.get('poppler', {})
-            if poppler_status.get('installed'):
-                st.caption("✅ **Poppler:** Installed")
-            else:
-                st.caption(f"❌ **Poppler:** {poppler_status.get('error', 'Not installed')}")
 
 
 def render_ollama_install_guide():
@@ -273,10 +265,6 @@ def check_system_ready_for_upload():
         missing_ocr = [n for n, s in ocr_status.get('ocr_models', {}).items() if not s.get('installed')]
         missing.append(f"No OCR models installed. Need: {', '.join(missing_ocr)}")
 
-    # Check Poppler
-    if not status.get('poppler', {}).get('installed'):
-        missing.append("Poppler not installed")
-
     return len(missing) == 0, missing
 
 
@@ -284,6 +272,7 @@ def prepare_ollama_models_background(progress_container=None):
     """Prepare Ollama models in background - force pull all required models."""
     models_status = check_required_ollama_models()
     required_models = models_status.get('required', [])
+    compatible_models = models_status.get('compatible_models_info')
     
     if not required_models:
         return {
@@ -301,12 +290,13 @@ def prepare_ollama_models_background(progress_container=None):
         # In airplane mode - can't download
         missing = models_status.get('missing_models', [])
         broken = models_status.get('broken_models', [])
+        not_working = frozenset(missing).union(broken)
         
         return {
             'success': False,
             'message': 'Cannot download models - airplane mode is enabled (security requirement)',
             'models_prepared': [],
-            'already_available': [m for m in required_models if m not in missing and m not in broken],
+            'already_available': [m for m in required_models if m not in not_working],
             'failed': missing + broken
         }
 
@@ -326,9 +316,9 @@ def prepare_ollama_models_background(progress_container=None):
                 progress_bar.progress(completed / total)
                 status_text.text(f"{completed}/{total} models processed")
 
-            result = download_all_required_models(progress_callback=progress_callback)
+            result = download_all_required_models(progress_callback=progress_callback, compatible_models=compatible_models)
     else:
-        result = download_all_required_models()
+        result = download_all_required_models(compatible_models=compatible_models)
 
     return {
         'success': result['success'],
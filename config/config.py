@@ -16,6 +16,18 @@ DIRECTORIES = {
 DATABASE_NAME = 'ai_mail_app.db'
 FULL_DATABASE_FILE_PATH = os.path.join('.', DATABASE_NAME)
 
+# Run the OCR models side by side on each document; turn off when RAM is
+# too tight to hold every OCR engine at once.
+OCR_PARALLEL_MODELS = True
+
+# Which LLM models get a level-2 call: "winner" (the best level-1 model),
+# "agreeing" (every model whose level-1 answer matched it) or "all".
+LLM_LEVEL_2_MODELS = "winner"
+
+# Seconds get_system_specs() reuses its CPU/memory/disk readings before
+# sampling again; the static hardware/OS fields are read once per process.
+SYSTEM_SPECS_TTL = 30
+
 
 # Streamlit Configurations
 
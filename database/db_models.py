@@ -1,6 +1,9 @@
 """Database models – dict-based, DRY, UUID-strategy driven, with console debug."""
 import sqlite3
 import os
+import atexit
+import threading
+from contextlib import contextmanager
 from typing import Any, Dict, List, Tuple, Optional
 
 from config.config import FULL_DATABASE_FILE_PATH
@@ -21,6 +24,40 @@ def create_connection():
     return conn
 
 
+_SHARED_CONN = None
+_SHARED_CONN_LOCK = threading.RLock()
+
+
+def get_connection():
+    """Process-wide autocommit connection (WAL) for short read helpers; use via shared_connection()."""
+    global _SHARED_CONN
+    with _SHARED_CONN_LOCK:
+        if _SHARED_CONN is None:
+            conn = sqlite3.connect(
+                FULL_DATABASE_FILE_PATH, check_same_thread=False, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            print(f"[DB] Shared connection opened to {FULL_DATABASE_FILE_PATH}")
+            _SHARED_CONN = conn
+        return _SHARED_CONN
+
+
+@contextmanager
+def shared_connection():
+    """Borrow the shared connection; the lock keeps threads from interleaving cursors on it."""
+    with _SHARED_CONN_LOCK:
+        yield get_connection()
+
+
+@atexit.register
+def _close_shared_connection():
+    global _SHARED_CONN
+    if _SHARED_CONN is not None:
+        _SHARED_CONN.close()
+        _SHARED_CONN = None
+
+
 # --------------------------------------------------------------------------- #
 # UUID STRATEGY REGISTRY
 # --------------------------------------------------------------------------- #
@@ -71,8 +108,8 @@ TABLE_OPTIONAL_FIELDS: Dict[str, List[str]] = {
     "user_role": ["description"],
     "user": ["first_name", "last_name", "email", "organization_uuid"],
     "automation": ["created_by", "updated_by"],  # kept only for legacy – will be ignored
-    "ocr_models": [],
-    "llm_models": [],
+    "ocr_models": ["render_scale"],
+    "llm_models": ["num_predict", "num_ctx"],
     "category": [
         "parent_category_uuid", "use_stamps", "description", "use_keywords", 
         "keywords", "use_llm", "high_min_threshold", "medium_min_threshold", 
@@ -112,7 +112,10 @@ TABLES = [
             ("logging_organization_uuid", "CREATE INDEX IF NOT EXISTS logging_organization_uuid ON logging (organization_uuid)"),
             ("logging_user_uuid", "CREATE INDEX IF NOT EXISTS logging_user_uuid ON logging (user_uuid)"),
             ("logging_page", "CREATE INDEX IF NOT EXISTS logging_page ON logging (page)"),
-            ("logging_level", "CREATE INDEX IF NOT EXISTS logging_level ON logging (level)")
+            ("logging_level", "CREATE INDEX IF NOT EXISTS logging_level ON logging (level)"),
+            # get_recent_logs: filter on any prefix of these, newest first, LIMIT
+            ("logging_filter", "CREATE INDEX IF NOT EXISTS logging_filter ON logging (organization_uuid, user_uuid, page, level, created_datetime DESC)"),
+            ("logging_created_datetime", "CREATE INDEX IF NOT EXISTS logging_created_datetime ON logging (created_datetime DESC)")
         ]
     },
     {
@@ -395,6 +398,13 @@ TABLES = [
                 "column_default": None,
                 "is_unique": False
             },
+            "render_scale": {
+                "primary_key": False,
+                "data_type": "REAL",
+                "null_constraint": "NULL",
+                "column_default": 2.0,
+                "is_unique": False
+            },
             **METADATA_FIELDS
         },
         "foreign_keys": [],
@@ -473,6 +483,20 @@ TABLES = [
                 "column_default": 0,
                 "is_unique": False
             },
+            "num_predict": {
+                "primary_key": False,
+                "data_type": "INTEGER",
+                "null_constraint": "NULL",
+                "column_default": 128,
+                "is_unique": False
+            },
+            "num_ctx": {
+                "primary_key": False,
+                "data_type": "INTEGER",
+                "null_constraint": "NULL",
+                "column_default": 2048,
+                "is_unique": False
+            },
             **METADATA_FIELDS
         },
         "foreign_keys": [],
@@ -956,7 +980,8 @@ INSERTS = [
         "columns": [
             "ocr_models_uuid", "name", "description", "min_storage_gb", "min_ram_gb",
             "gpu_required", "gpu_optional", "min_vram_gb", "default_language",
-            "default_dpi", "max_pages", "is_active", "created_datetime", "updated_datetime"
+            "default_dpi", "max_pages", "render_scale", "is_active", "created_datetime",
+            "updated_datetime"
         ],
         "uuid_keys": {"ocr_models_uuid": ["name"]},
         "data": [
@@ -970,7 +995,8 @@ INSERTS = [
                 "min_vram_gb": 0,
                 "default_language": "English",
                 "default_dpi": 400,
-                "max_pages": 30
+                "max_pages": 30,
+                "render_scale": 1.5
             },
             {
                 "name": "EasyOCR",
@@ -982,7 +1008,8 @@ INSERTS = [
                 "min_vram_gb": 4,
                 "default_language": "English",
                 "default_dpi": 500,
-                "max_pages": 30
+                "max_pages": 30,
+                "render_scale": 2.0
             },
             {
                 "name": "PaddleOCR",
@@ -994,11 +1021,14 @@ INSERTS = [
                 "min_vram_gb": 4,
                 "default_language": "English",
                 "default_dpi": 550,
-                "max_pages": 30
+                "max_pages": 30,
+                "render_scale": 2.0
             }
         ]
     },
     {
+        # Prefer quantized Ollama tags (e.g. "llama3.1:8b-instruct-q4_K_M") for new
+        # rows: they decode faster and leave room for more parallel contexts.
         "table": "llm_models",
         "columns": [
             "llm_model_uuid", "system", "name", "description", "min_ram_gb",
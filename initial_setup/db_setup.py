@@ -61,6 +61,29 @@ def generate_create_table_sql(table_def):
     return create_sql
 
 
+def add_missing_columns(cursor, table_def):
+    """ALTER existing tables to add columns introduced after they were created."""
+    table_name = table_def["name"]
+    cursor.execute(f"PRAGMA table_info({table_name})")
+    existing = {row[1] for row in cursor.fetchall()}
+
+    added = []
+    for col_name, col_config in table_def["columns"].items():
+        if col_name in existing or col_config["primary_key"]:
+            continue
+        parts = [col_name, col_config["data_type"]]
+        default_val = col_config["column_default"]
+        if default_val is not None:
+            if isinstance(default_val, str):
+                default_val = f"'{default_val}'"
+            elif isinstance(default_val, bool):
+                default_val = int(default_val)
+            parts.append(f"DEFAULT {default_val}")
+        cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN {' '.join(parts)}")
+        added.append(col_name)
+    return added
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # 2. Generic lookup: SELECT uuid_col FROM table WHERE col1=? AND col2=?
 # ─────────────────────────────────────────────────────────────────────────────
@@ -86,6 +109,25 @@ def lookup_uuid_from_db(conn, table_name, uuid_column, match_columns, match_valu
         return None
 
 
+def migrate_database():
+    """Add any schema columns and indexes missing from an existing database."""
+    conn = create_connection()
+    try:
+        c = conn.cursor()
+        for table in TABLES:
+            added = add_missing_columns(c, table)
+            if added:
+                print(f"INFO: Added columns to {table['name']}: {', '.join(added)}")
+            for index_name, index_sql in table.get("indexes", []):
+                try:
+                    c.execute(index_sql)
+                except sqlite3.Error as e:
+                    print(f"ERROR: Failed to create index {index_name}: {str(e)}")
+        conn.commit()
+    finally:
+        conn.close()
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # 3. Main setup function
 # ─────────────────────────────────────────────────────────────────────────────
@@ -105,8 +147,11 @@ def setup_database():
         create_sql = generate_create_table_sql(table)
         try:
             c.execute(create_sql)
+            added = add_missing_columns(c, table)
             conn.commit()
             print(f"INFO: Created table {table['name']}")
+            if added:
+                print(f"INFO: Added columns to {table['name']}: {', '.join(added)}")
         except sqlite3.Error as e:
             print(f"ERROR: Failed to create table {table['name']}: {str(e)}")
             conn.close()
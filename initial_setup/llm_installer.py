@@ -85,6 +85,24 @@ def get_ollama_install_instructions():
         }
 
 
+def _model_listed_by_cli(model_name):
+    """Spawn `ollama list` to see whether a model is already installed."""
+    try:
+        result = subprocess.run(
+            ['ollama', 'list'],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+        if result.returncode != 0:
+            return False
+        # First column of each row after the header, compared by base name (tag ignored)
+        installed = {line.partition(' ')[0].partition(':')[0] for line in result.stdout.splitlines()[1:] if line.strip()}
+        return model_name.partition(':')[0] in installed
+    except:
+        return False  # Continue to pull
+
+
 def install_ollama_model(model_name):
     """
     Install an Ollama model.
@@ -96,21 +114,12 @@ def install_ollama_model(model_name):
         dict: Installation result
     """
     # Check if model already exists
-    try:
-        result = subprocess.run(
-            ['ollama', 'list'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0 and model_name.split(':')[0] in result.stdout:
-            return {
-                'success': True,
-                'process': None,
-                'message': f'Model {model_name} already installed'
-            }
-    except:
-        pass  # Continue to pull
+    if _model_listed_by_cli(model_name):
+        return {
+            'success': True,
+            'process': None,
+            'message': f'Model {model_name} already installed'
+        }
 
     try:
         process = subprocess.Popen(
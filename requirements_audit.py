@@ -11,6 +11,7 @@ Outputs a CSV report at ./tmp/requirements_audit.csv
 
 import argparse
 import csv
+import functools
 import json
 import os
 import platform
@@ -36,11 +37,30 @@ print(f"DEFAULT_REQUIREMENTS_FILE: {DEFAULT_REQUIREMENTS_FILE}\nDEFAULT_VENV_DIR
 
 # -------- Utils --------
 
+_LINE_RE = re.compile(r"^\s*([A-Za-z0-9_.-]+(\[.*?\])?)")
+_NORM_RE = re.compile(r"[-_.]+")
+_EXTRAS_RE = re.compile(r"\[.*\]$")
+
+# str.translate tables for the common `name[extras]<op>version` shape: one C-level pass each
+_TERMINATORS = str.maketrans({c: " " for c in "[<>=!~;@,\t"})
+_NAME_CHARS = str.maketrans("", "", "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_.")
+_SEPARATORS = str.maketrans("_.", "--")
+
+def _fast_requirement_name(raw: str) -> Optional[str]:
+    """Normalized name via str methods, or None if the line needs the regex parser."""
+    name = raw.translate(_TERMINATORS).partition(" ")[0]
+    if not name or name.translate(_NAME_CHARS):
+        return None
+    name = name.translate(_SEPARATORS).lower()
+    while "--" in name:
+        name = name.replace("--", "-")
+    return name
+
 def pep503_normalize(name: str) -> str:
-    return re.sub(r"[-_.]+", "-", name).lower()
+    return _NORM_RE.sub("-", name).lower()
 
 def strip_extras(req_name: str) -> str:
-    return re.sub(r"\[.*\]$", "", req_name)
+    return _EXTRAS_RE.sub("", req_name)
 
 def parse_requirements(req_path: str) -> List[Tuple[str, str]]:
     if not os.path.exists(req_path):
@@ -51,7 +71,11 @@ def parse_requirements(req_path: str) -> List[Tuple[str, str]]:
             raw = line.strip()
             if not raw or raw.startswith("#"):
                 continue
-            m = re.match(r"^\s*([A-Za-z0-9_.-]+(\[.*?\])?)", raw)
+            fast = _fast_requirement_name(raw)
+            if fast is not None:
+                results.append((raw, fast))
+                continue
+            m = _LINE_RE.match(raw)
             if not m:
                 results.append((raw, pep503_normalize(raw)))
                 continue
@@ -80,7 +104,38 @@ def find_path_python() -> str:
             return py_launcher
     raise FileNotFoundError("No PATH-level Python found (tried `python` and `py`).")
 
+def _site_packages_mtime(python_exec: str) -> float:
+    """Newest mtime of the interpreter's site-packages dirs (changes when a dist-info is added/removed)."""
+    root = Path(python_exec).parent.parent
+    dirs = list(root.glob("lib/python*/site-packages")) + list(root.glob("Lib/site-packages"))
+    return max((d.stat().st_mtime for d in dirs), default=0.0)
+
 def get_installed_map(python_exec: str) -> Dict[str, str]:
+    python_exec = str(python_exec)
+    resolved = shutil.which(python_exec) or python_exec
+    try:
+        exe_mtime = os.stat(resolved).st_mtime
+    except OSError:
+        exe_mtime = 0.0
+    return dict(_cached_installed_map(python_exec, exe_mtime, _site_packages_mtime(resolved)))
+
+def _is_current_interpreter(python_exec: str) -> bool:
+    # Compare unresolved paths: a venv's python is a symlink to the base interpreter,
+    # so realpath() would wrongly equate two environments with different site-packages.
+    resolved = shutil.which(python_exec) or python_exec
+    return os.path.normcase(os.path.abspath(resolved)) == os.path.normcase(os.path.abspath(sys.executable))
+
+def _in_process_installed_map() -> Dict[str, str]:
+    import importlib.metadata as m
+    return {
+        sys.intern(pep503_normalize(dist.metadata['Name'])): dist.version
+        for dist in m.distributions() if dist.metadata and dist.metadata.get('Name')
+    }
+
+@functools.lru_cache(maxsize=8)
+def _cached_installed_map(python_exec: str, exe_mtime: float, site_mtime: float) -> Dict[str, str]:
+    if _is_current_interpreter(python_exec):
+        return _in_process_installed_map()
     if os.path.basename(python_exec).lower() == "py":
         cmd = [python_exec, "-3", "-c", _METADATA_SNIPPET]
     else:
@@ -92,7 +147,7 @@ def get_installed_map(python_exec: str) -> Dict[str, str]:
             f"Failed to query installed packages for {python_exec}:\n{e.output}"
         ) from e
     data = json.loads(out)
-    return {pep503_normalize(k): v for k, v in data.items()}
+    return {sys.intern(pep503_normalize(k)): v for k, v in data.items()}
 
 _METADATA_SNIPPET = r"""
 import json, sys
@@ -117,27 +172,15 @@ def audit_requirements(req_path: str, venv_dir: str) -> str:
         raise ValueError("No requirements found after parsing (file may be empty).")
     venv_python = find_venv_python(venv_dir)
     path_python = find_path_python()
+    # Keys are interned, so a package present in both environments shares one name string
     venv_installed = get_installed_map(venv_python)
     path_installed = get_installed_map(path_python)
-
-    rows = []
-    for raw, norm_name in reqs:
-        venv_ver = venv_installed.get(norm_name)
-        path_ver = path_installed.get(norm_name)
-        rows.append({
-            "requirement_line": raw,
-            "package": norm_name,
-            "in_venv": "Yes" if venv_ver else "No",
-            "venv_version": venv_ver or "",
-            "in_path": "Yes" if path_ver else "No",
-            "path_version": path_ver or "",
-            "venv_python": venv_python,
-            "path_python": path_python,
-        })
+    venv_names = frozenset(venv_installed)
+    path_names = frozenset(path_installed)
 
     tmp_dir = ensure_tmp_dir()
     csv_path = os.path.join(tmp_dir, "requirements_audit.csv")
-    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+    with open(csv_path, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
         writer = csv.DictWriter(
             f,
             fieldnames=[
@@ -152,7 +195,19 @@ def audit_requirements(req_path: str, venv_dir: str) -> str:
             ],
         )
         writer.writeheader()
-        writer.writerows(rows)
+        for raw, norm_name in reqs:
+            in_venv = norm_name in venv_names
+            in_path = norm_name in path_names
+            writer.writerow({
+                "requirement_line": raw,
+                "package": norm_name,
+                "in_venv": "Yes" if in_venv else "No",
+                "venv_version": venv_installed[norm_name] if in_venv else "",
+                "in_path": "Yes" if in_path else "No",
+                "path_version": path_installed[norm_name] if in_path else "",
+                "venv_python": venv_python,
+                "path_python": path_python,
+            })
     return csv_path
 
 # -------- CLI --------
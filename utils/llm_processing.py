@@ -1,11 +1,26 @@
 """LLM processing helper for document categorization using Ollama models."""
 
+import asyncio
+import functools
 import json
-from typing import Dict, List, Any, Tuple, Optional
+import os
+import re
+import threading
+from types import MappingProxyType
+from typing import Callable, Dict, List, Any, Mapping, Sequence, Tuple, Optional
 
 from langchain_ollama import OllamaLLM
-from langchain_core.prompts import PromptTemplate
-from database.db_models import create_connection
+from config.config import LLM_LEVEL_2_MODELS
+from database.db_models import shared_connection
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # stdlib parser is fine, just slower
+    _json_loads = json.loads
+
+# Last-resort extraction if a model still pads the JSON object with prose.
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.S)
 
 
 # ----------------------------------------------------------------------
@@ -27,111 +42,131 @@ def safe_json_loads(value, default=None):
         return default
 
 # ----------------------------------------------------------------------
-# 1. Database helpers (unchanged)
+# 1. Database helpers
 # ----------------------------------------------------------------------
-def get_available_llm_models() -> List[Dict[str, Any]]:
+# Models and categories only change through the admin pages, so the
+# lookups are memoised and handed out as read-only rows (tuples of
+# mapping proxies) that callers can share safely.  The admin pages call
+# clear_category_cache() after every write.
+def _category_row(row) -> Mapping[str, Any]:
+    return MappingProxyType({
+        "category_uuid": row[0],
+        "name": row[1],
+        "description": row[2],
+        "keywords": tuple(safe_json_loads(row[3], [])),
+        "use_keywords": row[4],
+        "high_min_threshold": row[5],
+        "medium_min_threshold": row[6],
+    })
+
+
+def clear_category_cache() -> None:
+    """Drop memoised LLM-model and category lookups after an admin edit."""
+    get_available_llm_models.cache_clear()
+    get_categories_for_org.cache_clear()
+
+
+@functools.lru_cache(maxsize=1)
+def get_available_llm_models() -> Tuple[Mapping[str, Any], ...]:
     """Get all active LLM models from the database."""
-    conn = create_connection()
-    cursor = conn.cursor()
-
     query = """
-        SELECT llm_model_uuid, system, name, is_vision_capable, default_timeout
+        SELECT llm_model_uuid, system, name, is_vision_capable, default_timeout,
+               num_predict, num_ctx
         FROM llm_models
         WHERE is_active = 1
         ORDER BY system, name
     """
-    cursor.execute(query)
-    rows = cursor.fetchall()
-    conn.close()
+    with shared_connection() as conn:
+        rows = conn.execute(query).fetchall()
 
-    return [
-        {
+    return tuple(
+        MappingProxyType({
             "llm_model_uuid": row[0],
             "system": row[1],
             "name": row[2],
             "is_vision_capable": row[3],
             "default_timeout": row[4],
-        }
+            "num_predict": row[5] or DEFAULT_NUM_PREDICT,
+            "num_ctx": row[6] or DEFAULT_NUM_CTX,
+        })
         for row in rows
-    ]
+    )
 
 
-def get_level_1_categories(organization_uuid: bytes) -> List[Dict[str, Any]]:
-    conn = create_connection()
-    cursor = conn.cursor()
+@functools.lru_cache(maxsize=32)
+def get_categories_for_org(organization_uuid: bytes) -> Mapping[str, Any]:
+    """Fetch level-1 and level-2 LLM categories for an organisation in one query.
 
+    Returns ``{"level_1": rows, "children_by_parent": {parent_uuid: rows}}``.
+    """
     query = """
         SELECT category_uuid, name, description, keywords,
-               use_keywords, high_min_threshold, medium_min_threshold
+               use_keywords, high_min_threshold, medium_min_threshold,
+               hierarchy_level, parent_category_uuid
         FROM category
         WHERE organization_uuid = ?
-          AND hierarchy_level = 1
+          AND hierarchy_level IN (1, 2)
           AND use_llm = 1
           AND is_active = 1
         ORDER BY name
     """
-    cursor.execute(query, (organization_uuid,))
-    rows = cursor.fetchall()
-    conn.close()
+    with shared_connection() as conn:
+        rows = conn.execute(query, (organization_uuid,)).fetchall()
 
-    return [
-        {
-            "category_uuid": row[0],
-            "name": row[1],
-            "description": row[2],
-            "keywords": safe_json_loads(row[3], []),
-            "use_keywords": row[4],
-            "high_min_threshold": row[5],
-            "medium_min_threshold": row[6],
-        }
-        for row in rows
-    ]
+    level_1 = []
+    children_by_parent: Dict[bytes, list] = {}
+    for row in rows:
+        if row[7] == 1:
+            level_1.append(_category_row(row))
+        else:
+            children_by_parent.setdefault(row[8], []).append(_category_row(row))
 
+    return MappingProxyType({
+        "level_1": tuple(level_1),
+        "children_by_parent": MappingProxyType(
+            {parent: tuple(children) for parent, children in children_by_parent.items()}
+        ),
+    })
 
-def get_level_2_categories(
-    organization_uuid: bytes, parent_category_uuid: bytes
-) -> List[Dict[str, Any]]:
-    conn = create_connection()
-    cursor = conn.cursor()
 
-    query = """
-        SELECT category_uuid, name, description, keywords,
-               use_keywords, high_min_threshold, medium_min_threshold
-        FROM category
-        WHERE organization_uuid = ?
-          AND parent_category_uuid = ?
-          AND hierarchy_level = 2
-          AND use_llm = 1
-          AND is_active = 1
-        ORDER BY name
-    """
-    cursor.execute(query, (organization_uuid, parent_category_uuid))
-    rows = cursor.fetchall()
-    conn.close()
+def get_level_1_categories(organization_uuid: bytes) -> Tuple[Mapping[str, Any], ...]:
+    return get_categories_for_org(organization_uuid)["level_1"]
 
-    return [
-        {
-            "category_uuid": row[0],
-            "name": row[1],
-            "description": row[2],
-            "keywords": safe_json_loads(row[3], []),
-            "use_keywords": row[4],
-            "high_min_threshold": row[5],
-            "medium_min_threshold": row[6],
-        }
-        for row in rows
-    ]
+
+def get_level_2_categories(
+    organization_uuid: bytes, parent_category_uuid: bytes
+) -> Tuple[Mapping[str, Any], ...]:
+    children = get_categories_for_org(organization_uuid)["children_by_parent"]
+    return children.get(parent_category_uuid, ())
 
 
 # ----------------------------------------------------------------------
 # 2. Prompt builder 
 # ----------------------------------------------------------------------
+def _categories_signature(categories: Sequence[Mapping[str, Any]]) -> Tuple[tuple, ...]:
+    """Hashable digest of the category fields the prompt uses."""
+    return tuple(
+        (cat["name"], cat["description"], bool(cat.get("use_keywords")), tuple(cat.get("keywords") or ()))
+        for cat in categories
+    )
+
+
 def build_categorization_prompt(
-    categories: List[Dict[str, Any]],
+    categories: Sequence[Mapping[str, Any]],
     level: int,
     parent_category_name: Optional[str] = None,
 ) -> str:
     """Build the prompt for LLM categorization."""
+    return _build_prompt(level, parent_category_name, _categories_signature(categories))
+
+
+@functools.lru_cache(maxsize=64)
+def _build_prompt(
+    level: int,
+    parent_category_name: Optional[str],
+    signature: Tuple[tuple, ...],
+) -> str:
+    """Prompt text per (level, parent, category set); identical for every document."""
     base_context = (
         "I'm working at a collections law firm and need to categorize the following physical piece of mail "
         "which was scanned into a PDF file. The quality of these PDFs vary between files. "
@@ -145,11 +180,11 @@ def build_categorization_prompt(
 
     # Category list
     category_text = f"Available Level {level} Categories:\n\n"
-    for cat in categories:
-        category_text += f"Category: {cat['name']}\n"
-        category_text += f"Description: {cat['description']}\n"
-        if cat.get("keywords") and cat.get("use_keywords"):
-            category_text += f"Keywords: {', '.join(cat['keywords'])}\n"
+    for name, description, use_keywords, keywords in signature:
+        category_text += f"Category: {name}\n"
+        category_text += f"Description: {description}\n"
+        if keywords and use_keywords:
+            category_text += f"Keywords: {', '.join(keywords)}\n"
         category_text += "\n"
 
     json_format = (
@@ -168,13 +203,83 @@ def build_categorization_prompt(
 # ----------------------------------------------------------------------
 # 3. Core LLM call
 # ----------------------------------------------------------------------
+# The answer is a small JSON object, so generation is capped well below the
+# model defaults; both limits can be overridden per model in llm_models.
+DEFAULT_NUM_PREDICT = 128
+DEFAULT_NUM_CTX = 2048
+
+
+@functools.lru_cache(maxsize=32)
+def _get_llm(model_name: str, timeout: int, num_predict: int, num_ctx: int) -> OllamaLLM:
+    """One OllamaLLM (and its HTTP clients) per model/settings, reused across documents."""
+    # format="json" makes Ollama constrain decoding to a single JSON object.
+    return OllamaLLM(
+        model=model_name,
+        timeout=timeout,
+        format="json",
+        num_predict=num_predict,
+        num_ctx=num_ctx,
+        temperature=0.0,
+        top_p=1.0,
+    )
+
+
+def _render_prompt(
+    document_text: str,
+    categories: Sequence[Mapping[str, Any]],
+    level: int,
+    parent_category_name: Optional[str],
+) -> str:
+    """Full prompt text; plain substitution, so braces in OCR text need no escaping."""
+    prompt_str = build_categorization_prompt(categories, level, parent_category_name)
+    return prompt_str.replace("{document_text}", document_text)
+
+
+def _parse_llm_response(model_name: str, raw_response: str) -> Dict[str, Any]:
+    """Parse and validate the JSON object returned in Ollama's JSON mode."""
+    try:
+        result = _json_loads(raw_response)
+    except ValueError:
+        match = _JSON_OBJECT_RE.search(raw_response)
+        if not match:
+            raise
+        result = _json_loads(match.group(0))
+
+    # Validate required keys
+    required = {"category", "confidence", "reasoning"}
+    if not required.issubset(result):
+        raise ValueError(f"Missing keys; got {set(result.keys())}")
+
+    result.update(
+        {
+            "model_used": model_name,
+            "success": True,
+            "error": None,
+        }
+    )
+    return result
+
+
+def _failed_result(model_name: str, exc: Exception) -> Dict[str, Any]:
+    return {
+        "success": False,
+        "category": None,
+        "confidence": 0.0,
+        "reasoning": None,
+        "model_used": model_name,
+        "error": str(exc),
+    }
+
+
 def categorize_with_llm(
     model_name: str,
     document_text: str,
-    categories: List[Dict[str, Any]],
+    categories: Sequence[Mapping[str, Any]],
     level: int,
     parent_category_name: Optional[str] = None,
     timeout: int = 60,
+    num_predict: int = DEFAULT_NUM_PREDICT,
+    num_ctx: int = DEFAULT_NUM_CTX,
 ) -> Dict[str, Any]:
     """
     Categorize a document using an Ollama LLM model.
@@ -190,85 +295,121 @@ def categorize_with_llm(
         }
     """
     try:
-        # 1. Initialise the Ollama LLM
-        llm = OllamaLLM(model=model_name, timeout=timeout)
+        llm = _get_llm(model_name, timeout, num_predict, num_ctx)
+        prompt = _render_prompt(document_text, categories, level, parent_category_name)
+        raw_response: str = llm.invoke(prompt)
+        return _parse_llm_response(model_name, raw_response)
+    except Exception as exc:  # pragma: no cover
+        return _failed_result(model_name, exc)
 
-        # 2. Build the prompt template (only one variable)
-        prompt_str = build_categorization_prompt(
-            categories, level, parent_category_name
-        )
-        prompt = PromptTemplate.from_template(prompt_str)
-
-        # 3. **Modern chain** – no LLMChain, just pipe
-        chain = prompt | llm
-
-        # 4. Run the chain
-        raw_response: str = chain.invoke({"document_text": document_text})
-
-        # ------------------------------------------------------------------
-        # 5. Extract JSON (models sometimes wrap it in markdown)
-        # ------------------------------------------------------------------
-        response_text = raw_response.strip()
-
-        # Strip possible markdown fences
-        if "```json" in response_text:
-            start = response_text.find("```json") + 7
-            end = response_text.find("```", start)
-            response_text = response_text[start:end].strip()
-        elif "```" in response_text:
-            start = response_text.find("```") + 3
-            end = response_text.find("```", start)
-            response_text = response_text[start:end].strip()
-
-        result = json.loads(response_text)
-
-        # Validate required keys
-        required = {"category", "confidence", "reasoning"}
-        if not required.issubset(result):
-            raise ValueError(f"Missing keys; got {set(result.keys())}")
-
-        result.update(
-            {
-                "model_used": model_name,
-                "success": True,
-                "error": None,
-            }
-        )
-        return result
 
+async def acategorize_with_llm(
+    model_name: str,
+    document_text: str,
+    categories: Sequence[Mapping[str, Any]],
+    level: int,
+    parent_category_name: Optional[str] = None,
+    timeout: int = 60,
+    num_predict: int = DEFAULT_NUM_PREDICT,
+    num_ctx: int = DEFAULT_NUM_CTX,
+) -> Dict[str, Any]:
+    """Async twin of categorize_with_llm (same return shape), for running several models at once."""
+    try:
+        llm = _get_llm(model_name, timeout, num_predict, num_ctx)
+        prompt = _render_prompt(document_text, categories, level, parent_category_name)
+        raw_response: str = await llm.ainvoke(prompt)
+        return _parse_llm_response(model_name, raw_response)
     except Exception as exc:  # pragma: no cover
-        return {
-            "success": False,
-            "category": None,
-            "confidence": 0.0,
-            "reasoning": None,
-            "model_used": model_name,
-            "error": str(exc),
-        }
+        return _failed_result(model_name, exc)
+
+
+# Upper bound on requests batch_categorize keeps in flight; match the
+# server's OLLAMA_NUM_PARALLEL so extra requests don't just queue there.
+OLLAMA_NUM_PARALLEL = int(os.environ.get("OLLAMA_NUM_PARALLEL") or 4)
+
+_LOOP = None
+_LOOP_LOCK = threading.Lock()
+
+
+def _run_async(coro):
+    """Run coro on one long-lived background loop; the cached LLMs' async clients stay bound to it."""
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            _LOOP = asyncio.new_event_loop()
+            threading.Thread(target=_LOOP.run_forever, name="llm-event-loop", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _LOOP).result()
+
+
+async def _categorize_with_all_models(
+    llm_models: Sequence[Mapping[str, Any]],
+    document_text: str,
+    categories: Sequence[Mapping[str, Any]],
+    level: int,
+    parent_category_name: Optional[str] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    stop_when: Optional[Callable[[Dict[str, Any]], bool]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Ask every model concurrently; results keep llm_models order.
+
+    The Ollama server only overlaps these requests when started with
+    OLLAMA_NUM_PARALLEL >= number of requests and OLLAMA_MAX_LOADED_MODELS
+    >= number of distinct models; otherwise it queues them. ``semaphore``
+    caps in-flight requests when several documents share the server.
+    If ``stop_when`` accepts a result, the models still running are
+    cancelled and only the finished results are returned.
+    """
+    async def _one(m):
+        call = acategorize_with_llm(
+            model_name=m["name"],
+            document_text=document_text,
+            categories=categories,
+            level=level,
+            parent_category_name=parent_category_name,
+            timeout=m["default_timeout"],
+            num_predict=m["num_predict"],
+            num_ctx=m["num_ctx"],
+        )
+        if semaphore is None:
+            return await call
+        async with semaphore:
+            return await call
+
+    if stop_when is None or len(llm_models) < 2:
+        return await asyncio.gather(*(_one(m) for m in llm_models))
+
+    tasks = [asyncio.ensure_future(_one(m)) for m in llm_models]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            if stop_when(await next_done):
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+    return [t.result() for t in tasks if t.done() and not t.cancelled()]
 
 
 # ----------------------------------------------------------------------
-# 4. Document-content helpers (unchanged)
+# 4. Document-content helpers
 # ----------------------------------------------------------------------
 def get_document_content(
     document_uuid: bytes, is_vision_capable: bool
 ) -> Tuple[Optional[str], Optional[bytes]]:
     """Return OCR text **or** PDF bytes depending on model capability."""
-    conn = create_connection()
-    cursor = conn.cursor()
-
+    # Only vision models touch the (multi-MB) pdf BLOB; text models read OCR text.
     if is_vision_capable:
         query = "SELECT pdf FROM document WHERE document_uuid = ?"
-        cursor.execute(query, (document_uuid,))
-        row = cursor.fetchone()
-        conn.close()
-        return None, row[0] if row else None
+        with shared_connection() as conn:
+            row = conn.execute(query, (document_uuid,)).fetchone()
+        pdf = row[0] if row else None
+        return (None, pdf)
 
     query = "SELECT ocr_text FROM document_category WHERE document_uuid = ?"
-    cursor.execute(query, (document_uuid,))
-    row = cursor.fetchone()
-    conn.close()
-    return row[0] if row else None, None
+    with shared_connection() as conn:
+        row = conn.execute(query, (document_uuid,)).fetchone()
+    ocr_text = row[0] if row else None
+    return (ocr_text, None)
 
 
 # ----------------------------------------------------------------------
@@ -286,12 +427,44 @@ def calculate_confidence_level(
 
 
 # ----------------------------------------------------------------------
-# 6. Full pipeline (unchanged except using the new categorize_with_llm)
+# 6. Full pipeline
 # ----------------------------------------------------------------------
 def process_document_categorization(
     document_uuid: bytes, organization_uuid: bytes, ocr_text: str
 ) -> Dict[str, Any]:
     """Run level-1 then level-2 categorisation."""
+    return _run_async(_acategorize_document(document_uuid, organization_uuid, ocr_text))
+
+
+def batch_categorize(
+    docs: Sequence[Tuple[bytes, str]], organization_uuid: bytes
+) -> List[Dict[str, Any]]:
+    """
+    Categorise several ``(document_uuid, ocr_text)`` pairs at once.
+
+    All documents are in flight together so Ollama can batch them; at most
+    OLLAMA_NUM_PARALLEL requests are outstanding. Results keep ``docs`` order
+    and have the same shape as process_document_categorization.
+    """
+    async def _batch():
+        semaphore = asyncio.Semaphore(OLLAMA_NUM_PARALLEL)
+        return await asyncio.gather(
+            *(
+                _acategorize_document(document_uuid, organization_uuid, ocr_text, semaphore)
+                for document_uuid, ocr_text in docs
+            )
+        )
+
+    return _run_async(_batch())
+
+
+async def _acategorize_document(
+    document_uuid: bytes,
+    organization_uuid: bytes,
+    ocr_text: str,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> Dict[str, Any]:
+    """Level-1 then level-2 categorisation of one document (runs on the LLM loop)."""
     results = {
         "document_uuid": document_uuid,
         "level_1": {},
@@ -305,21 +478,15 @@ def process_document_categorization(
         return results
 
     # ---- Level 1 ------------------------------------------------------
-    level_1_categories = get_level_1_categories(organization_uuid)
+    org_categories = get_categories_for_org(organization_uuid)
+    level_1_categories = org_categories["level_1"]
     if not level_1_categories:
         results["error"] = "No level 1 categories available"
         return results
 
-    level_1_results = [
-        categorize_with_llm(
-            model_name=m["name"],
-            document_text=ocr_text,
-            categories=level_1_categories,
-            level=1,
-            timeout=m["default_timeout"],
-        )
-        for m in llm_models
-    ]
+    level_1_results = await _categorize_with_all_models(
+        llm_models, ocr_text, level_1_categories, level=1, semaphore=semaphore
+    )
 
     successful_l1 = [r for r in level_1_results if r.get("success")]
     if not successful_l1:
@@ -343,24 +510,35 @@ def process_document_categorization(
         return results
 
     # ---- Level 2 ------------------------------------------------------
-    level_2_categories = get_level_2_categories(
-        organization_uuid, parent_cat["category_uuid"]
+    level_2_categories = org_categories["children_by_parent"].get(
+        parent_cat["category_uuid"], ()
     )
     if not level_2_categories:
         results["level_2"]["message"] = "No level-2 categories for this parent"
         return results
 
-    level_2_results = [
-        categorize_with_llm(
-            model_name=m["name"],
-            document_text=ocr_text,
-            categories=level_2_categories,
-            level=2,
-            parent_category_name=best_l1["category"],
-            timeout=m["default_timeout"],
-        )
-        for m in llm_models
-    ]
+    if LLM_LEVEL_2_MODELS == "winner":
+        level_2_models = [m for m in llm_models if m["name"] == best_l1["model_used"]]
+    elif LLM_LEVEL_2_MODELS == "agreeing":
+        agreeing = {r["model_used"] for r in successful_l1 if r["category"] == best_l1["category"]}
+        level_2_models = [m for m in llm_models if m["name"] in agreeing]
+    else:  # "all"
+        level_2_models = llm_models
+
+    high_thresholds = {c["name"]: c["high_min_threshold"] for c in level_2_categories}
+
+    def _high_confidence(result: Dict[str, Any]) -> bool:
+        threshold = high_thresholds.get(result.get("category"))
+        try:
+            return threshold is not None and float(result["confidence"]) >= threshold
+        except (TypeError, ValueError, KeyError):
+            return False
+
+    level_2_results = await _categorize_with_all_models(
+        level_2_models, ocr_text, level_2_categories, level=2,
+        parent_category_name=best_l1["category"], semaphore=semaphore,
+        stop_when=_high_confidence,
+    )
 
     successful_l2 = [r for r in level_2_results if r.get("success")]
     if successful_l2:
@@ -3,17 +3,21 @@
 import os
 import sys
 import json
+import sqlite3
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import streamlit as st
 from PIL import Image
-from typing import List, Union
+from typing import Iterator, List, Union
 
 # Ensure project root is in path
 if __name__ == "__main__":
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from config.config import FULL_DATABASE_FILE_PATH
+from config.config import FULL_DATABASE_FILE_PATH, OCR_PARALLEL_MODELS
 from initial_setup.system_checker import check_ocr_dependencies
-from initial_setup.poppler_installer import install_poppler
 
 
 print(f"Current Directory: {os.getcwd()}")
@@ -33,75 +37,119 @@ def get_available_ocr_models() -> List[str]:
 # --------------------------------------------------------------
 # Helper: Split text into non-empty lines (exactly like fitz version)
 # --------------------------------------------------------------
-def _split_into_lines(text: str) -> List[str]:
+def _split_into_lines(text: str) -> Iterator[str]:
     """
-    Normalise any line-ending to '\\n' and return a list of non-empty,
-    stripped lines - exactly the same behaviour as the fitz version.
+    Iterate the non-empty, stripped lines of ``text`` - exactly the same
+    behaviour as the fitz version (splitlines handles '\\r\\n' and '\\r').
     """
-    return [
-        line.strip()
-        for line in text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
-        if line.strip()
-    ]
+    return (line for line in map(str.strip, text.splitlines()) if line)
 
 
 # --------------------------------------------------------------
 # INTERNAL: Load PDF / image from path **or** bytes → list of PIL images
 # --------------------------------------------------------------
-def _load_pdf_or_image(document_input: Union[str, bytes]) -> List["Image.Image"]:
+# PDFium is not thread-safe – not even across separate documents – so
+# every pdfium call goes through this lock (Streamlit serves each session
+# on its own thread).
+_PDFIUM_LOCK = threading.Lock()
+
+# Render scale when ocr_models has no value for a model (pdfium renders at
+# 72 DPI per unit of scale); pages are capped at this many pixels per side.
+DEFAULT_RENDER_SCALE = 2.0
+_MAX_PAGE_SIDE_PX = 2500
+
+# Tesseract binarises internally, so it gets 8-bit grayscale pages (a third
+# of the RGB bytes); the neural models keep colour.
+_GRAYSCALE_MODELS = frozenset({"Tesseract"})
+
+
+@functools.lru_cache(maxsize=1)
+def get_ocr_render_scales() -> dict:
+    """Map OCR model name → render_scale from ocr_models (cached; see clear_ocr_render_scales)."""
+    from database.db_models import shared_connection
+
+    try:
+        with shared_connection() as conn:
+            rows = conn.execute("SELECT name, render_scale FROM ocr_models").fetchall()
+    except sqlite3.Error as e:
+        print(f"[DEBUG] OCR render scales unavailable, using defaults: {e}")
+        return {}
+    return {name: float(scale) for name, scale in rows if scale}
+
+
+def clear_ocr_render_scales() -> None:
+    """Drop the cached render scales after an admin edit."""
+    get_ocr_render_scales.cache_clear()
+
+
+def _render_pdf_pages(
+    source: Union[str, bytes], scale: float = DEFAULT_RENDER_SCALE, grayscale: bool = False
+) -> List["Image.Image"]:
+    """Rasterise every page of a PDF (path or bytes) to a PIL image (mode 'L' if grayscale)."""
+    import pypdfium2 as pdfium
+
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(source)
+        try:
+            images = []
+            for i in range(len(pdf)):
+                page = pdf[i]
+                # Oversized pages are rendered smaller rather than resized afterwards
+                long_side_pt = max(page.get_size())
+                page_scale = min(scale, _MAX_PAGE_SIDE_PX / long_side_pt) if long_side_pt else scale
+                images.append(page.render(scale=page_scale, grayscale=grayscale).to_pil())
+                page.close()
+            return images
+        finally:
+            pdf.close()
+
+
+def _prepare_image(img: "Image.Image", grayscale: bool) -> "Image.Image":
+    img.thumbnail((_MAX_PAGE_SIDE_PX, _MAX_PAGE_SIDE_PX))
+    return img.convert('L') if grayscale else img
+
+
+def _load_pdf_or_image(
+    document_input: Union[str, bytes],
+    scale: float = DEFAULT_RENDER_SCALE,
+    grayscale: bool = False,
+) -> List["Image.Image"]:
     """
     Accepts a file path (str) **or** raw PDF/image bytes.
-    Returns a list of PIL.Image.Image (one per page for PDFs).
+    Returns a list of PIL.Image.Image (one per page for PDFs), rendered at
+    ``scale`` and capped at _MAX_PAGE_SIDE_PX on the long side.
     """
     from PIL import Image
     import io
-    import pypdfium2 as pdfium
 
     # ----- 1. Path (string) -------------------------------------------------
     if isinstance(document_input, str):
         if document_input.lower().endswith('.pdf'):
-            pdf = pdfium.PdfDocument(document_input)
-            images = []
-            for i in range(len(pdf)):
-                page = pdf[i]
-                bitmap = page.render(scale=2.0)
-                img = bitmap.to_pil()
-                images.append(img)
-                page.close()
-            pdf.close()
-            return images
+            return _render_pdf_pages(document_input, scale, grayscale)
         else:  # single image file
-            return [Image.open(document_input)]
+            return [_prepare_image(Image.open(document_input), grayscale)]
 
     # ----- 2. Bytes ---------------------------------------------------------
     if isinstance(document_input, (bytes, bytearray)):
         # Try to treat as PDF first
         try:
-            pdf = pdfium.PdfDocument(document_input)
-            images = []
-            for i in range(len(pdf)):
-                page = pdf[i]
-                bitmap = page.render(scale=2.0)
-                img = bitmap.to_pil()
-                images.append(img)
-                page.close()
-            pdf.close()
-            return images
+            return _render_pdf_pages(document_input, scale, grayscale)
         except Exception:  # not a PDF → treat as single image
             buf = io.BytesIO(document_input)
-            return [Image.open(buf)]
+            return [_prepare_image(Image.open(buf), grayscale)]
 
     raise ValueError("document_input must be a path (str) or PDF/image bytes")
 
 
 # --------------------------------------------------------------
-# NEW: Convert PDF pages to PNG image bytes for database storage
+# NEW: Convert PDF pages to image bytes for database storage
 # --------------------------------------------------------------
 def convert_pdf_to_image_bytes(document_input: Union[str, bytes]) -> bytes:
     """
-    Convert all pages of a PDF into a single PNG image stored as bytes.
+    Convert all pages of a PDF into a single multi-page TIFF stored as bytes.
     
-    For multi-page PDFs, pages are stacked vertically with spacing.
+    Each page becomes its own TIFF frame (lossless deflate), so pages are
+    encoded one at a time instead of being pasted into one tall composite.
     
     Parameters
     ----------
@@ -111,38 +159,53 @@ def convert_pdf_to_image_bytes(document_input: Union[str, bytes]) -> bytes:
     Returns
     -------
     bytes
-        PNG image bytes containing all PDF pages.
+        Multi-page TIFF bytes, one frame per PDF page.
     """
     import io
     
     images = _load_pdf_or_image(document_input)
     
-    if len(images) == 1:
-        buf = io.BytesIO()
-        images[0].save(buf, format='PNG')
-        return buf.getvalue()
-    
-    # Multi-page: stack vertically with spacing
-    spacing = 20
-    widths = [img.width for img in images]
-    heights = [img.height for img in images]
-    
-    max_width = max(widths)
-    total_height = sum(heights) + spacing * (len(images) - 1)
-    
-    combined = Image.new('RGB', (max_width, total_height), 'white')
-    
-    y_offset = 0
-    for img in images:
-        x_offset = (max_width - img.width) // 2
-        combined.paste(img, (x_offset, y_offset))
-        y_offset += img.height + spacing
-    
     buf = io.BytesIO()
-    combined.save(buf, format='PNG')
+    images[0].save(
+        buf,
+        format='TIFF',
+        compression='tiff_deflate',
+        save_all=True,
+        append_images=images[1:],
+    )
     return buf.getvalue()
 
 
+# --------------------------------------------------------------
+# INTERNAL: Cached OCR engines (weights load once per process)
+# --------------------------------------------------------------
+_READER_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _load_easyocr_reader(lang: str = "en"):
+    import easyocr
+    return easyocr.Reader([lang])
+
+
+@functools.lru_cache(maxsize=1)
+def _load_paddle_ocr(lang: str = "en"):
+    from paddleocr import PaddleOCR
+    return PaddleOCR(use_angle_cls=True, lang=lang)
+
+
+def _easyocr_reader(lang: str = "en"):
+    """Shared easyocr.Reader; the lock stops concurrent reruns loading it twice."""
+    with _READER_LOCK:
+        return _load_easyocr_reader(lang)
+
+
+def _paddle_ocr(lang: str = "en"):
+    """Shared PaddleOCR instance; the lock stops concurrent reruns loading it twice."""
+    with _READER_LOCK:
+        return _load_paddle_ocr(lang)
+
+
 # --------------------------------------------------------------
 # INTERNAL: Run OCR on images using the specified model
 # --------------------------------------------------------------
@@ -151,55 +214,95 @@ def _extract_pages_safe(model_name: str, images: List["Image.Image"]) -> List[st
     Extract text from images using the specified OCR model.
     Returns a list of strings (one per page).
     """
-    import tempfile
-    import shutil
-
     if model_name == "Tesseract":
         import pytesseract
+        if len(images) == 1:
+            return [pytesseract.image_to_string(images[0])]
+        # Each call runs a separate tesseract process, so pages OCR in parallel.
+        workers = min(len(images), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(pytesseract.image_to_string, images))
+
+    elif model_name == "EasyOCR":
+        reader = _easyocr_reader()
         pages = []
         for img in images:
-            text = pytesseract.image_to_string(img)
-            pages.append(text)
+            result = reader.readtext(np.asarray(img.convert("RGB")))
+            lines = [word_info[1] for word_info in result]
+            pages.append("\n".join(lines))
         return pages
 
-    elif model_name == "EasyOCR":
-        import easyocr
-        reader = easyocr.Reader(['en'])
+    elif model_name == "PaddleOCR":
+        ocr = _paddle_ocr()
         pages = []
         for img in images:
-            tmp_dir = tempfile.mkdtemp()
-            try:
-                p = os.path.join(tmp_dir, "temp.png")
-                img.save(p, "PNG")
-                result = reader.readtext(p)
-                lines = [word_info[1] for word_info in result]
-                pages.append("\n".join(lines))
-            finally:
-                shutil.rmtree(tmp_dir, ignore_errors=True)
+            # PaddleOCR follows OpenCV and expects BGR channel order for arrays;
+            # the reversed view has a negative stride, which OpenCV can reject
+            bgr = np.ascontiguousarray(np.asarray(img.convert("RGB"))[:, :, ::-1])
+            result = ocr.ocr(bgr, cls=True)
+            lines = [word_info[1][0] for line in result for word_info in line]
+            pages.append("\n".join(lines))
         return pages
 
-    elif model_name == "PaddleOCR":
-        from paddleocr import PaddleOCR
-        ocr = PaddleOCR(use_angle_cls=True, lang='en')
-        tmp_dir = tempfile.mkdtemp()
-        img_paths = []
+    else:
+        raise ValueError(f"Unknown model: {model_name}")
+
+
+# --------------------------------------------------------------
+# INTERNAL: Render once per (scale, colour) and run each model
+# --------------------------------------------------------------
+def _run_ocr_models(
+    document_input: Union[str, bytes], models_to_try: List[str], failure_label: str
+) -> dict:
+    """
+    OCR the document with every model in ``models_to_try``.
+
+    Models run concurrently (they are mostly native code on disjoint
+    resources) unless OCR_PARALLEL_MODELS is off. Results keep the order
+    of ``models_to_try``; failing models are logged and left out.
+    """
+    render_scales = get_ocr_render_scales()
+    model_keys = {
+        m: (render_scales.get(m, DEFAULT_RENDER_SCALE), m in _GRAYSCALE_MODELS)
+        for m in models_to_try
+    }
+
+    # Rendering is serialised by _PDFIUM_LOCK anyway, so do it up front
+    rendered = {}  # (scale, grayscale) → page images, shared read-only by models that match
+    for key in dict.fromkeys(model_keys.values()):
         try:
-            for i, img in enumerate(images):
-                p = os.path.join(tmp_dir, f"page_{i+1}.png")
-                img.save(p, "PNG")
-                img_paths.append(p)
-
-            pages = []
-            for p in img_paths:
-                result = ocr.ocr(p, cls=True)
-                lines = [word_info[1][0] for line in result for word_info in line]
-                pages.append("\n".join(lines))
-            return pages
-        finally:
-            shutil.rmtree(tmp_dir, ignore_errors=True)
+            rendered[key] = _load_pdf_or_image(document_input, *key)
+        except Exception as e:
+            rendered[key] = e
+
+    def _ocr(model_name):
+        images = rendered[model_keys[model_name]]
+        if isinstance(images, Exception):
+            raise images
+        return _extract_pages_safe(model_name, images)
 
+    def _collect(model_name, call):
+        try:
+            raw_pages = call()
+        except Exception as e:
+            print(f"[DEBUG] {model_name} {failure_label}: {e}")
+            return
+        total = len(raw_pages)
+        results[model_name] = {
+            f"Page {i} out of {total}": "\n".join(_split_into_lines(page_text))
+            for i, page_text in enumerate(raw_pages, start=1)
+        }
+
+    results = {}
+    if OCR_PARALLEL_MODELS and len(models_to_try) > 1:
+        with ThreadPoolExecutor(max_workers=len(models_to_try)) as executor:
+            futures = [(m, executor.submit(_ocr, m)) for m in models_to_try]
+            for model_name, future in futures:
+                _collect(model_name, future.result)
     else:
-        raise ValueError(f"Unknown model: {model_name}")
+        for model_name in models_to_try:
+            _collect(model_name, lambda: _ocr(model_name))
+    return results
 
 
 # --------------------------------------------------------------
@@ -224,7 +327,6 @@ def process_document_with_available_ocr(
     str
         JSON string with one entry per successful model.
     """
-    install_poppler()
     available_models = get_available_ocr_models()
     if not available_models:
         return json.dumps({'error': 'No OCR models available on this system'})
@@ -236,20 +338,7 @@ def process_document_with_available_ocr(
     else:
         models_to_try = available_models
 
-    results = {}
-    images = _load_pdf_or_image(document_input)
-
-    for model_name in models_to_try:
-        try:
-            raw_pages = _extract_pages_safe(model_name, images)
-            total = len(raw_pages)
-            results[model_name] = {
-                f"Page {i} out of {total}": "\n".join(_split_into_lines(page_text))
-                for i, page_text in enumerate(raw_pages, start=1)
-            }
-        except Exception as e:
-            print(f"[DEBUG] {model_name} failed: {e}")
-            continue
+    results = _run_ocr_models(document_input, models_to_try, "failed")
 
     if not results:
         error_results = {'error': 'All available OCR models failed'}
@@ -280,7 +369,6 @@ def process_document_with_all_ocr_models(
     str
         JSON string with one entry per successful model.
     """
-    install_poppler()
     all_models = ["Tesseract", "EasyOCR", "PaddleOCR"]
     
     models_to_try = []
@@ -290,20 +378,7 @@ def process_document_with_all_ocr_models(
     else:
         models_to_try = all_models
 
-    results = {}
-    images = _load_pdf_or_image(document_input)
-
-    for model_name in models_to_try:
-        try:
-            raw_pages = _extract_pages_safe(model_name, images)
-            total = len(raw_pages)
-            results[model_name] = {
-                f"Page {i} out of {total}": "\n".join(_split_into_lines(page_text))
-                for i, page_text in enumerate(raw_pages, start=1)
-            }
-        except Exception as e:
-            print(f"[DEBUG] {model_name} skipped: {e}")
-            continue
+    results = _run_ocr_models(document_input, models_to_try, "skipped")
 
     if not results:
         error_results = {'error': 'All OCR models failed or are unavailable'}
@@ -2,13 +2,14 @@
 import os
 import sys
 import datetime
+import operator
 from datetime import timezone
 
 # Ensure project root is in path
 if __name__ == "__main__":
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from config.config import *
+from config.config import DIRECTORIES
 
 
 
@@ -29,6 +30,9 @@ def create_root_directories():
         print(f"Checked/created directory: {path}")
 
 
+_ENTRY_NAME = operator.attrgetter("name")
+
+
 def print_directory_tree(startpath, indent="", prefix="", exclude_dot_folders=True):
     """
     Print the directory structure starting from startpath, including all subfolders and files.
@@ -45,66 +49,78 @@ def print_directory_tree(startpath, indent="", prefix="", exclude_dot_folders=Tr
         print(f"Directory '{startpath}' does not exist.")
         return
 
-    # Get the base name of the start path
-    base_name = os.path.basename(os.path.abspath(startpath))
-    print(f"{indent}{prefix}{base_name}/")
-
-    # Get all entries in the directory, excluding folders starting with '.' if specified
-    entries = sorted(os.listdir(startpath))  # Sort for consistent output
-    if exclude_dot_folders:
-        entries = [e for e in entries if not (os.path.isdir(os.path.join(startpath, e)) and e.startswith('.'))]
-    
-    entries_count = len(entries)
-    
-    for i, entry in enumerate(entries):
-        entry_path = os.path.join(startpath, entry)
-        is_last = i == entries_count - 1  # Check if this is the last entry
-        new_prefix = "└── " if is_last else "├── "
-        new_indent = indent + ("    " if is_last else "│   ")
-
-        if os.path.isdir(entry_path):
-            # Recursively print subdirectory
-            print_directory_tree(entry_path, new_indent, new_prefix, exclude_dot_folders)
-        else:
-            # Print file
-            print(f"{indent}{new_prefix}{entry}")
+    # Depth-first with an explicit stack; lines are collected and written once.
+    # A stack item is either a directory to expand or an already formatted line.
+    out = []
+    stack = [(startpath, indent, prefix, os.path.basename(os.path.abspath(startpath)))]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            out.append(item)
+            continue
+
+        path, indent, prefix, name = item
+        out.append(f"{indent}{prefix}{name}/\n")
+
+        # scandir reports the entry type from readdir, so no extra stat per entry.
+        # Dot folders are dropped while scanning (cheap name check first) so
+        # they are never sorted.
+        with os.scandir(path) as it:
+            if exclude_dot_folders:
+                entries = [e for e in it if not (e.name.startswith('.') and e.is_dir(follow_symlinks=False))]
+            else:
+                entries = list(it)
+        entries.sort(key=_ENTRY_NAME)  # Sort in place for consistent output
+
+        children = []
+        last = len(entries) - 1  # index of the entry that gets the └── glyph
+        for i, entry in enumerate(entries):
+            new_prefix = "└── " if i == last else "├── "
+            if entry.is_dir(follow_symlinks=False):
+                new_indent = indent + ("    " if i == last else "│   ")
+                children.append((entry.path, new_indent, new_prefix, entry.name))
+            else:
+                children.append(f"{indent}{new_prefix}{entry.name}\n")
+        stack.extend(reversed(children))  # pop in sorted order
+
+    sys.stdout.write("".join(out))
 
 
 # print_directory_tree(APP_DIRECTORY)
 
 
-def custom_badge(label, color="gray", icon=""):
-    colors = {
-        # Core
-        "green":   "#10B981",  # emerald-500
-        "red":     "#EF4444",  # red-500
-        "orange":  "#F59E0B",  # amber-500
-        "gray":    "#6B7280",  # slate-500
-        
-        # New colors
-        "blue":    "#3B82F6",  # blue-500
-        "indigo":  "#6366F1",  # indigo-500
-        "purple":  "#8B5CF6",  # violet-500
-        "pink":    "#EC4899",  # pink-500
-        "yellow":  "#FBBF24",  # yellow-400
-        "teal":    "#14B8A6",  # teal-500
-        "cyan":    "#06B6D4",  # cyan-500
-        "lime":    "#84CC16",  # lime-500
-        
-        # Light variants
-        "lightgreen": "#86EFAC",
-        "lightred":   "#FCA5A5",
-        "lightblue":  "#93C5FD",
-        
-        # Dark / status
-        "success": "#10B981",
-        "warning": "#F59E0B",
-        "danger":  "#EF4444",
-        "info":    "#3B82F6",
-        "neutral": "#6B7280",
-    }
-    bg = colors.get(color, "#6B7280")
-    html = f"""
+_BADGE_COLORS = {
+    # Core
+    "green":   "#10B981",  # emerald-500
+    "red":     "#EF4444",  # red-500
+    "orange":  "#F59E0B",  # amber-500
+    "gray":    "#6B7280",  # slate-500
+    
+    # New colors
+    "blue":    "#3B82F6",  # blue-500
+    "indigo":  "#6366F1",  # indigo-500
+    "purple":  "#8B5CF6",  # violet-500
+    "pink":    "#EC4899",  # pink-500
+    "yellow":  "#FBBF24",  # yellow-400
+    "teal":    "#14B8A6",  # teal-500
+    "cyan":    "#06B6D4",  # cyan-500
+    "lime":    "#84CC16",  # lime-500
+    
+    # Light variants
+    "lightgreen": "#86EFAC",
+    "lightred":   "#FCA5A5",
+    "lightblue":  "#93C5FD",
+    
+    # Dark / status
+    "success": "#10B981",
+    "warning": "#F59E0B",
+    "danger":  "#EF4444",
+    "info":    "#3B82F6",
+    "neutral": "#6B7280",
+}
+
+# One HTML template per color, built once; custom_badge only fills in icon/label
+_BADGE_TEMPLATE = """
     <div style="
         display: inline-flex;
         justify-content: top;
@@ -117,7 +133,11 @@ def custom_badge(label, color="gray", icon=""):
         font-size: 14px;
         border: 2px solid {bg};
     ">
-        {icon} {label}
+        {{icon}} {{label}}
     </div>
     """
-    return html
\ No newline at end of file
+_BADGE_TEMPLATES = {color: _BADGE_TEMPLATE.format(bg=bg) for color, bg in _BADGE_COLORS.items()}
+
+
+def custom_badge(label, color="gray", icon=""):
+    return _BADGE_TEMPLATES.get(color, _BADGE_TEMPLATES["gray"]).format(icon=icon, label=label)
\ No newline at end of file
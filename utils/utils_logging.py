@@ -1,25 +1,148 @@
 """Logging utility for tracking user interactions and system events."""
 import sqlite3
 import os
+import atexit
 import logging
-import random
+import queue
+import sys
 import json
+import contextlib
+import datetime
+import itertools
+import threading
+import time
+import uuid
 
 from config.config import FULL_DATABASE_FILE_PATH
-from utils.utils_system_specs import get_system_specs
-from utils.utils_uuid import generate_uuid
-from utils.utils import get_utc_datetime
+from utils.utils_system_specs import get_system_specs, specs_to_json
 
 
 # --------------------------------------------------------------------------- #
 # CONNECTION
 # --------------------------------------------------------------------------- #
+_THREAD_CONN = threading.local()
+
+
 def create_connection():
-    conn = sqlite3.connect(FULL_DATABASE_FILE_PATH)
-    print(f"[DB] Connected to {FULL_DATABASE_FILE_PATH}")
+    """Return this thread's persistent logging connection (autocommit, WAL), opening it on first use."""
+    conn = getattr(_THREAD_CONN, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(FULL_DATABASE_FILE_PATH, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA foreign_keys=ON")
+        _THREAD_CONN.conn = conn
     return conn
 
 
+# --------------------------------------------------------------------------- #
+# BACKGROUND LOG WRITER
+# --------------------------------------------------------------------------- #
+# Log rows are queued and written by one daemon thread in batches of up to
+# _LOG_BATCH_SIZE rows (or whatever arrived within _LOG_FLUSH_INTERVAL
+# seconds), one transaction per batch instead of one commit per line.
+# The queue is bounded: if the database falls behind, Logging.insert spills
+# rows to stderr rather than blocking the Streamlit thread or growing memory.
+_LOG_INSERT_SQL = (
+    "INSERT INTO logging (logging_uuid, organization_uuid, user_uuid, page, message, level, created_datetime) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_LOG_BATCH_SIZE = 500
+_LOG_FLUSH_INTERVAL = 0.05
+_LOG_QUEUE_SIZE = 10000
+_LOG_QUEUE = queue.Queue(maxsize=_LOG_QUEUE_SIZE)
+_LOG_STOP = object()
+_LOG_WRITER = None
+_LOG_WRITER_LOCK = threading.Lock()
+
+
+def _next_log_batch(first):
+    """Collect rows after ``first`` until the batch is full or the flush interval passes."""
+    batch = [first]
+    deadline = time.monotonic() + _LOG_FLUSH_INTERVAL
+    while len(batch) < _LOG_BATCH_SIZE:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            row = _LOG_QUEUE.get(timeout=remaining)
+        except queue.Empty:
+            break
+        if row is _LOG_STOP:
+            return batch, True
+        batch.append(row)
+    return batch, False
+
+
+def _iso_from_ns(ns):
+    """ISO-8601 UTC string for a time.time_ns() stamp, same format as get_utc_datetime()."""
+    seconds, micros = divmod(ns // 1000, 1_000_000)
+    return datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc).replace(microsecond=micros).isoformat()
+
+
+def _log_writer():
+    conn = create_connection()
+    try:
+        stop = False
+        while not stop:
+            first = _LOG_QUEUE.get()
+            if first is _LOG_STOP:
+                break
+            batch, stop = _next_log_batch(first)
+            # Rows carry a time_ns() stamp; format it here, off the caller's thread
+            batch = [row[:-1] + (_iso_from_ns(row[-1]),) for row in batch]
+            try:
+                conn.execute("BEGIN")  # one transaction per batch
+                conn.executemany(_LOG_INSERT_SQL, batch)
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                _write_rows_individually(conn, batch)
+    finally:
+        _THREAD_CONN.conn = None
+        conn.close()
+
+
+def _spill_row(row):
+    """Last-resort stderr output for a log row that couldn't be queued or written."""
+    print(f"[{row[5]}] {row[3]}: {row[4]}", file=sys.stderr)
+
+
+def _write_rows_individually(conn, batch):
+    """Retry a failed batch row by row so one bad row doesn't drop the rest."""
+    for row in batch:
+        try:
+            conn.execute(_LOG_INSERT_SQL, row)  # autocommit
+        except sqlite3.Error as e:
+            print(f"ERROR: Failed to write log: {e}", file=sys.stderr)
+            _spill_row(row)
+
+
+def _ensure_log_writer():
+    global _LOG_WRITER
+    if _LOG_WRITER is None:
+        with _LOG_WRITER_LOCK:
+            if _LOG_WRITER is None:
+                _LOG_WRITER = threading.Thread(target=_log_writer, name="log-writer", daemon=True)
+                _LOG_WRITER.start()
+
+
+@atexit.register
+def flush_logs(timeout=5.0):
+    """Write out everything queued so far and stop the writer thread."""
+    global _LOG_WRITER
+    with _LOG_WRITER_LOCK:
+        writer, _LOG_WRITER = _LOG_WRITER, None
+    if writer is not None:
+        try:
+            _LOG_QUEUE.put(_LOG_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        writer.join(timeout)
+
+
 # --------------------------------------------------------------------------- #
 # LOGGING MODEL (moved here)
 # --------------------------------------------------------------------------- #
@@ -29,28 +152,18 @@ class Logging:
 
     @staticmethod
     def insert(organization_uuid, user_uuid, page, message, level):
-        conn = create_connection()
-        c = conn.cursor()
-        c.execute("PRAGMA foreign_keys = ON")
-        now = get_utc_datetime()
-        random_number = random.randint(1, 999999999)
-        logging_uuid = generate_uuid(f"{organization_uuid}{user_uuid}{page}{str(random_number)}")
-        logging_sql = f"""
-INSERT INTO logging (logging_uuid, organization_uuid, user_uuid, page, message, level, created_datetime)
-VALUES ('{logging_uuid}', '{organization_uuid}', '{user_uuid}', '{page}', '{message}', '{level}', '{now}')
-"""
-        # print(f"{logging_uuid}\t{page}\t{random_number}")
-        # print(f"{logging_sql}")
-
+        """Queue a log row for the background writer and return its UUID immediately."""
+        now = time.time_ns()  # formatted to ISO by the writer thread
+        logging_uuid = str(uuid.uuid4())
+        _ensure_log_writer()
+        # Bound as parameters, so quotes in messages need no escaping; text
+        # columns are stringified like the old f-string SQL did.
+        row = (logging_uuid, organization_uuid, user_uuid, str(page), str(message), str(level), now)
         try:
-            c.execute(logging_sql)
-            conn.commit()
-            return logging_uuid
-        except Exception as e:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+            _LOG_QUEUE.put_nowait(row)
+        except queue.Full:
+            _spill_row(row)
+        return logging_uuid
 
 
 # --------------------------------------------------------------------------- #
@@ -104,17 +217,29 @@ class AppLogger:
 # HELPER FUNCTIONS
 # --------------------------------------------------------------------------- #
 def get_logger_from_session(session_state, console_output=False):
-    org_uuid = session_state.get('org_uuid')
-    user_uuid = session_state.get('user_uuid')
-    return AppLogger(org_uuid, user_uuid, console_output)
+    """Return the session's AppLogger, rebuilding it only when the org/user changes."""
+    org_uuid = session_state.get('org_uuid') or ""
+    user_uuid = session_state.get('user_uuid') or ""
+    logger = session_state.get('_app_logger')
+    if (logger is None
+            or logger.organization_uuid != org_uuid
+            or logger.user_uuid != user_uuid
+            or logger.console_output != console_output):
+        logger = AppLogger(org_uuid, user_uuid, console_output)
+        session_state['_app_logger'] = logger
+    return logger
+
+
+# Compact JSON for payloads stored in log messages (indent=4 roughly doubled the bytes)
+_COMPACT_JSON = {"separators": (",", ":"), "default": str}
 
 
 def log_landing_page(session_state, page_name): 
-    get_logger_from_session(session_state).info(page_name, json.dumps(get_system_specs(), indent=4, default=str))
+    get_logger_from_session(session_state).info(page_name, specs_to_json(get_system_specs()))
 
 
 def log_system_status(session_state, system_status_payload, page_name='/system_status'): 
-    get_logger_from_session(session_state).info(page_name, json.dumps(system_status_payload, indent=4, default=str))
+    get_logger_from_session(session_state).info(page_name, json.dumps(system_status_payload, **_COMPACT_JSON))
 
 
 def log_page_view(session_state, page_name):
@@ -156,18 +281,32 @@ def log_database_operation(session_state, page_name, operation, table, success=T
         logger.error(page_name, message)
 
 
+# One fixed SQL string per combination of filters (2**4 shapes), so
+# sqlite3's statement cache reuses the prepared statement on every call.
+_LOG_FILTER_COLUMNS = ("organization_uuid", "user_uuid", "page", "level")
+_RECENT_LOGS_SQL = {
+    shape: "SELECT * FROM logging WHERE 1=1"
+           + "".join(f" AND {col} = ?" for col, used in zip(_LOG_FILTER_COLUMNS, shape) if used)
+           + " ORDER BY created_datetime DESC LIMIT ?"
+    for shape in itertools.product((False, True), repeat=len(_LOG_FILTER_COLUMNS))
+}
+
+
+_LOG_FETCH_SIZE = 256
+
+
 def get_recent_logs(limit=100, organization_uuid=None, user_uuid=None, page=None, level=None):
+    """Yield the newest matching log rows, fetched _LOG_FETCH_SIZE at a time."""
     conn = create_connection()
-    c = conn.cursor()
-    query = "SELECT * FROM logging WHERE 1=1"
-    params = []
-    if organization_uuid: query += " AND organization_uuid = ?"; params.append(organization_uuid)
-    if user_uuid: query += " AND user_uuid = ?"; params.append(user_uuid)
-    if page: query += " AND page = ?"; params.append(page)
-    if level: query += " AND level = ?"; params.append(level)
-    query += " ORDER BY created_datetime DESC LIMIT ?"
+    filters = (organization_uuid, user_uuid, page, level)
+    query = _RECENT_LOGS_SQL[tuple(bool(value) for value in filters)]
+    params = [value for value in filters if value]
     params.append(limit)
-    c.execute(query, params)
-    results = c.fetchall()
-    conn.close()
-    return results
\ No newline at end of file
+    # The connection is this thread's persistent one; only the cursor is closed
+    with contextlib.closing(conn.cursor()) as c:
+        c.execute(query, params)
+        while True:
+            rows = c.fetchmany(_LOG_FETCH_SIZE)
+            if not rows:
+                break
+            yield from rows
\ No newline at end of file
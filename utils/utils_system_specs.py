@@ -1,9 +1,19 @@
 import os
 import sys
+import re
 import json
+import ctypes
 import socket
-import platform
-import psutil
+import time
+import functools
+import collections
+import threading
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:  # stdlib encoder is fine, just slower
+    orjson = None
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Set project root and change working directory
@@ -13,7 +23,7 @@ os.chdir(PROJECT_ROOT)
 
 try:
     from utils.utils_uuid import derive_uuid
-    from config.config import FULL_DATABASE_FILE_PATH
+    from config.config import FULL_DATABASE_FILE_PATH, SYSTEM_SPECS_TTL
 except ImportError as e:
     print(f"ERROR: Failed to import required modules: {str(e)}")
     sys.exit(1)
@@ -23,103 +33,313 @@ except ImportError as e:
 # Functions to get metadata
 # ─────────────────────────────────────────────────────────────────────────────
 
+# psutil and platform are imported on first use (psutil's C extension is
+# slow to load); get_hostname() callers such as the DB layer never pay for it.
+psutil = None
+platform = None
+_PLATFORM = None  # processor_info block, shared by every specs result
+_PLATFORM_FULL = None
+_CPU_CORES_PHYSICAL = None
+_CPU_CORES_LOGICAL = None
+_SYSTEM_MODULES_LOCK = threading.Lock()
+
+
+def _load_system_modules():
+    """Import psutil/platform and read the process-lifetime platform facts, once."""
+    global psutil, platform, _PLATFORM, _PLATFORM_FULL, _CPU_CORES_PHYSICAL, _CPU_CORES_LOGICAL
+    if psutil is not None:
+        return
+    with _SYSTEM_MODULES_LOCK:
+        if psutil is not None:
+            return
+        import platform as _platform_module
+        import psutil as _psutil_module
+
+        # Prime psutil's CPU counter so later non-blocking cpu_percent calls have a baseline
+        _psutil_module.cpu_percent(interval=None)
+
+        uname = _platform_module.uname()
+        _PLATFORM = MappingProxyType({
+            "system": uname.system,
+            "node": uname.node,
+            "release": uname.release,
+            "version": uname.version,
+            "machine": uname.machine,
+            "processor": uname.processor,
+        })
+        _PLATFORM_FULL = _platform_module.platform()
+        _CPU_CORES_PHYSICAL = _psutil_module.cpu_count(logical=False)
+        _CPU_CORES_LOGICAL = _psutil_module.cpu_count(logical=True)
+        platform = _platform_module
+        psutil = _psutil_module  # set last: it marks loading as complete
+
+
+# Hostname and its UUID don't change mid-process; refresh_hostname() re-reads them
+_HOSTNAME = socket.gethostname()
+_HOSTNAME_UUID = derive_uuid(_HOSTNAME)
+
+
 def get_hostname():
-    hostname = socket.gethostname()
-    return hostname
+    return _HOSTNAME
 
 
-def get_system_specs():
+def refresh_hostname():
+    """Re-read the hostname (e.g. after a container rename) and drop cached specs."""
+    global _HOSTNAME, _HOSTNAME_UUID
+    _HOSTNAME = socket.gethostname()
+    _HOSTNAME_UUID = derive_uuid(_HOSTNAME)
+    _get_static_specs.cache_clear()
+    clear_system_specs_cache()
+    return _HOSTNAME
+
+
+# NVIDIA driver libraries; loading any of them means a usable NVIDIA GPU driver is installed
+# (macOS has no NVIDIA driver, so there is nothing to probe)
+if sys.platform == "win32":
+    _GPU_LIBRARIES = ("nvml.dll", "nvcuda.dll")
+elif sys.platform == "darwin":
+    _GPU_LIBRARIES = ()
+else:
+    _GPU_LIBRARIES = ("libnvidia-ml.so.1", "libcuda.so.1")
+
+
+def _probe_gpu():
     """
-    Retrieve system specifications including machine name, OS, CPU, cores, GPU availability,
-    hard drive space, CPU utilization, processor information, and **Python version**.
-    Returns a JSON-compatible dictionary.
+    Return True if an NVIDIA GPU is present. Asks NVML for the device count when
+    pynvml is installed, otherwise checks that a driver library can be loaded.
     """
     try:
-        # Initialize dictionary to store specs
-        specs = {}
+        import pynvml
+    except ImportError:  # optional; fall back to the dlopen probe
+        pynvml = None
+
+    if pynvml is not None:
+        try:
+            pynvml.nvmlInit()
+            try:
+                return pynvml.nvmlDeviceGetCount() > 0
+            finally:
+                pynvml.nvmlShutdown()
+        except pynvml.NVMLError:
+            return False
+
+    for name in _GPU_LIBRARIES:
+        try:
+            ctypes.CDLL(name)
+            return True
+        except OSError:
+            continue
+    return False
+
+
+@functools.lru_cache(maxsize=1)
+def _get_static_specs():
+    """
+    Specs that cannot change while the process runs (host, OS, Python, CPU model, GPU).
+    Built from the _PLATFORM snapshot and returned read-only.
+    """
+    python_build = platform.python_build()
 
+    specs = {
         # Machine name
-        hostname = socket.gethostname()
-        specs["hostname"] = hostname
+        "hostname": _HOSTNAME,
 
         # Machine UUID
-        specs["hostname_uuid"] = derive_uuid(hostname)
+        "hostname_uuid": _HOSTNAME_UUID,
 
         # Operating system details
-        specs["os"] = {
-            "name": platform.system(),
-            "version": platform.release(),
-            "full_name": platform.platform()
-        }
+        "os": {
+            "name": _PLATFORM["system"],
+            "version": _PLATFORM["release"],
+            "full_name": _PLATFORM_FULL
+        },
 
         # Python version
-        specs["python"] = {
+        "python": {
             "version": platform.python_version(),
             "version_tuple": sys.version_info[:3],  # (major, minor, micro)
             "implementation": platform.python_implementation(),
             "executable": sys.executable,
-            "build": platform.python_build()[0],
-            "build_date": platform.python_build()[1]
-        }
-
-        # CPU details
-        specs["cpu"] = {
-            "name": platform.processor(),
-            "architecture": platform.machine(),
-            "cores_physical": psutil.cpu_count(logical=False),
-            "cores_logical": psutil.cpu_count(logical=True),
-            "utilization_percent": psutil.cpu_percent(interval=1)
-        }
-
-        # GPU availability (basic check)
-        specs["gpu_available"] = False  # Default to False
-        try:
-            for proc in psutil.process_iter(['name']):
-                proc_name = proc.info['name'] or ""
-                if 'nvidia' in proc_name.lower() or 'cuda' in proc_name.lower():
-                    specs["gpu_available"] = True
-                    break
-        except Exception:
-            specs["gpu_available"] = "Unknown (requires additional libraries for accurate detection)"
-
-        # Hard drive space (for root directory)
-        try:
-            disk = psutil.disk_usage('/')
-            specs["disk"] = {
-                "total_mb": round(disk.total / (1024 * 1024), 2),
-                "used_mb": round(disk.used / (1024 * 1024), 2),
-                "free_mb": round(disk.free / (1024 * 1024), 2),
-                "total_gb": round(disk.total / (1024 * 1024 * 1024), 2),
-                "used_gb": round(disk.used / (1024 * 1024 * 1024), 2),
-                "free_gb": round(disk.free / (1024 * 1024 * 1024), 2)
-            }
-        except Exception as e:
-            specs["disk"] = {"error": f"Could not retrieve disk info: {str(e)}"}
-
-        # Memory information
-        memory = psutil.virtual_memory()
-        specs["memory"] = {
-            "total_mb": round(memory.total / (1024 * 1024), 2),
-            "used_mb": round(memory.used / (1024 * 1024), 2),
-            "free_mb": round(memory.free / (1024 * 1024), 2),
-            "total_gb": round(memory.total / (1024 * 1024 * 1024), 2),
-            "used_gb": round(memory.used / (1024 * 1024 * 1024), 2),
-            "free_gb": round(memory.free / (1024 * 1024 * 1024), 2)
-        }
+            "build": python_build[0],
+            "build_date": python_build[1]
+        },
+
+        # CPU details (utilization is filled in per call)
+        "cpu": {
+            "name": _PLATFORM["processor"],
+            "architecture": _PLATFORM["machine"],
+            "cores_physical": _CPU_CORES_PHYSICAL,
+            "cores_logical": _CPU_CORES_LOGICAL,
+        },
+
+        # GPU availability (basic check: can the NVIDIA driver library be loaded)
+        "gpu_available": _probe_gpu(),
 
         # Additional processor info (if available)
-        specs["processor_info"] = {
-            "system": platform.system(),
-            "node": platform.node(),
-            "release": platform.release(),
-            "version": platform.version(),
-            "machine": platform.machine(),
-            "processor": platform.processor()
-        }
-
-        return specs
+        "processor_info": _PLATFORM,
+    }
+    return MappingProxyType({
+        key: MappingProxyType(value) if isinstance(value, dict) else value
+        for key, value in specs.items()
+    })
+
+
+_MB = 1 << 20
+
+
+@functools.lru_cache(maxsize=8)
+def _total_fields(total):
+    """Rounded MB/GB for a total size; totals don't change, so this is a cache hit."""
+    total_mb = total / _MB
+    return round(total_mb, 2), round(total_mb / 1024, 2)
+
+
+def _size_fields(usage):
+    """MB/GB fields for a psutil usage tuple; only used/free are scaled per call."""
+    total_mb, total_gb = _total_fields(usage.total)
+    used_mb = usage.used / _MB
+    free_mb = usage.free / _MB
+    return {
+        "total_mb": total_mb,
+        "used_mb": round(used_mb, 2),
+        "free_mb": round(free_mb, 2),
+        "total_gb": total_gb,
+        "used_gb": round(used_mb / 1024, 2),
+        "free_gb": round(free_mb / 1024, 2)
+    }
+
+
+_SizeUsage = collections.namedtuple("_SizeUsage", "total used free")
+
+# On Linux, memory is read straight from /proc/meminfo (three fields, one read)
+_READ_PROC_MEMINFO = sys.platform.startswith("linux")
+_MEMINFO_RE = re.compile(rb"^(MemTotal|MemAvailable|MemFree):\s+(\d+) kB", re.M)
+
+
+def _memory_usage():
+    """total/used/free in bytes; used = total - available, as monitoring tools report it."""
+    if _READ_PROC_MEMINFO:
+        try:
+            with open("/proc/meminfo", "rb") as f:
+                fields = {name: int(kb) << 10 for name, kb in _MEMINFO_RE.findall(f.read())}
+            total = fields[b"MemTotal"]
+            free = fields[b"MemFree"]
+            return _SizeUsage(total, total - fields.get(b"MemAvailable", free), free)
+        except (OSError, KeyError):
+            pass  # unusual procfs; use psutil below
+    memory = psutil.virtual_memory()
+    return _SizeUsage(memory.total, memory.total - memory.available, memory.free)
+
+
+def _disk_usage(path):
+    """total/used/free in bytes; one os.statvfs call on POSIX, psutil elsewhere."""
+    if hasattr(os, "statvfs"):
+        st = os.statvfs(path)
+        # Same arithmetic as psutil.disk_usage: free is what non-root users can
+        # use, used excludes root-reserved blocks
+        return _SizeUsage(st.f_blocks * st.f_frsize,
+                          (st.f_blocks - st.f_bfree) * st.f_frsize,
+                          st.f_bavail * st.f_frsize)
+    disk = psutil.disk_usage(path)
+    return _SizeUsage(disk.total, disk.used, disk.free)
+
+
+def get_cpu_utilization(sample_sec=1.0):
+    """
+    Blocking CPU utilization sampled over sample_sec seconds, for callers that
+    need a fresh measurement rather than the since-last-call figure in get_system_specs().
+    """
+    _load_system_modules()
+    return psutil.cpu_percent(interval=sample_sec)
+
+
+# Specs stay plain dicts: callers read them with .get() chains
+# (system_checker) and hand them straight to json.dumps (logging,
+# ai_analysis metadata). The nested blocks are built once and only
+# shallow-copied here.
+def _copy_specs(specs):
+    """Plain, caller-owned copy of a specs dict (nested blocks copied one level deep)."""
+    return {
+        key: dict(value) if isinstance(value, (dict, MappingProxyType)) else value
+        for key, value in specs.items()
+    }
+
+
+# (monotonic timestamp, specs) of the last assembled specs, reused for
+# SYSTEM_SPECS_TTL seconds. Swapped as one tuple so lock-free reads are
+# consistent; _SPECS_LOCK makes concurrent misses wait for one collection.
+_SPECS_CACHE = None
+_SPECS_LOCK = threading.Lock()
+
+
+def clear_system_specs_cache():
+    """Force the next get_system_specs() call to re-read the live fields."""
+    global _SPECS_CACHE
+    _SPECS_CACHE = None
+
+
+def _fresh_cached_specs():
+    entry = _SPECS_CACHE
+    if entry is not None and time.monotonic() - entry[0] < SYSTEM_SPECS_TTL:
+        return entry[1]
+    return None
+
+
+def _collect_specs():
+    """Static specs plus live CPU utilization, disk and memory."""
+    _load_system_modules()
+    specs = _copy_specs(_get_static_specs())
+
+    # Utilization since the previous call; returns immediately
+    specs["cpu"]["utilization_percent"] = psutil.cpu_percent(interval=None)
+
+    # Hard drive space (for root directory)
+    try:
+        specs["disk"] = _size_fields(_disk_usage('/'))
     except Exception as e:
-        return {"error": f"Failed to retrieve system specs: {str(e)}"}
+        specs["disk"] = {"error": f"Could not retrieve disk info: {str(e)}"}
+
+    # Memory information
+    specs["memory"] = _size_fields(_memory_usage())
+    return specs
+
+
+def get_system_specs():
+    """
+    Retrieve system specifications including machine name, OS, CPU, cores, GPU availability,
+    hard drive space, CPU utilization, processor information, and **Python version**.
+    Returns a JSON-compatible dictionary.
+
+    Static fields are computed once per process; CPU utilization, disk and
+    memory are read (without blocking) at most every SYSTEM_SPECS_TTL seconds.
+    Safe to call from several threads; only one of them collects on a miss.
+    """
+    global _SPECS_CACHE
+    specs = _fresh_cached_specs()
+    if specs is None:
+        with _SPECS_LOCK:
+            specs = _fresh_cached_specs()  # another thread may have just collected
+            if specs is None:
+                # The one catch-all sits here at the module boundary, on the miss
+                # path only: callers (batch metadata, landing-page log, hardware
+                # checks) expect an {"error": ...} dict rather than an exception.
+                try:
+                    specs = _collect_specs()
+                except Exception as e:
+                    print(f"ERROR: Failed to retrieve system specs: {str(e)}")
+                    return {"error": f"Failed to retrieve system specs: {str(e)}"}
+                _SPECS_CACHE = (time.monotonic(), specs)
+    return _copy_specs(specs)
+
+
+get_system_specs.cache_clear = clear_system_specs_cache
+
+
+def specs_to_json(specs):
+    """Compact JSON text for a specs dict (no indentation; orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(specs, default=str).decode()
+    return json.dumps(specs, separators=(",", ":"), default=str)
 
 
 # Example usage:
@@ -1,6 +1,20 @@
 # utils/utils_uuid.py
 import uuid
+import hashlib
 import datetime
+import functools
+
+def _uuid5_str(namespace, name):
+    """
+    str(uuid.uuid5(namespace, name)) computed directly from the SHA-1 digest,
+    skipping the UUID object construction and validation.
+    """
+    b = bytearray(hashlib.sha1(namespace.bytes + name.encode("utf-8")).digest()[:16])
+    b[6] = (b[6] & 0x0F) | 0x50  # version 5
+    b[8] = (b[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = b.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
 
 def generate_uuid(input_string=None, namespace=uuid.NAMESPACE_DNS):
     """
@@ -26,9 +40,7 @@ def generate_uuid(input_string=None, namespace=uuid.NAMESPACE_DNS):
     combined_input = timestamp + (input_string or "")
     
     # Generate UUID using uuid5
-    uuid_from_combined = uuid.uuid5(namespace, combined_input)
-    
-    return str(uuid_from_combined)
+    return _uuid5_str(namespace, combined_input)
 
 
 def derive_uuid(input_string, namespace=uuid.NAMESPACE_DNS):
@@ -50,5 +62,10 @@ def derive_uuid(input_string, namespace=uuid.NAMESPACE_DNS):
     if not input_string:
         raise ValueError("Input string cannot be empty")
     
-    uuid_from_string = uuid.uuid5(namespace, input_string)
-    return str(uuid_from_string)
+    return _derive_uuid_cached(input_string, namespace)
+
+
+@functools.lru_cache(maxsize=4096)
+def _derive_uuid_cached(input_string, namespace):
+    """uuid5 string for already-validated input; repeat inputs skip the SHA-1."""
+    return _uuid5_str(namespace, input_string)